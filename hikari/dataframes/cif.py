@@ -1,16 +1,23 @@
 import abc
 from collections import UserDict
+from concurrent.futures import ProcessPoolExecutor
+import io
+import json
+import mmap
+import os
 import pathlib
 import re
 import tempfile
-from typing import Any, Callable, Sequence, TypeVar
+from typing import Any, Callable, Iterable, Iterator, Sequence, TypeVar
 
 from enum import Enum
 from functools import lru_cache
 from typing import Union, TextIO
 
-from hikari.resources import cif_core_dict
-from hikari.utility import make_abspath
+import numpy as np
+
+from hikari import resources
+from hikari.utility import cfloats_with_su, make_abspath
 
 
 T = TypeVar('T')
@@ -45,26 +52,109 @@ class CifBlock(UserDict):
                 raise TypeError(f'Unknown value type of {value}: {type(value)}')
         return value
 
-    def read(self, path: str, block: str) -> None:
+    def get_as_array(
+            self,
+            key: str,
+            dtype: Union[type, np.dtype, str] = float,
+            default: Any = None,
+            su: bool = False,
+    ) -> Union[np.ndarray, tuple[np.ndarray, np.ndarray]]:
+        """
+        Get value of `self[key]` converted in bulk to a NumPy array of `dtype`.
+        Floating-point values are parsed with standard uncertainties in
+        parentheses stripped, while cif unknown "?" and inapplicable "."
+        values become nan. A single value produces a 0-dimensional array.
+
+        :param key: key associated with accessed element
+        :param dtype: type of output array; floating, integer, or other
+        :param default: if given, return it on KeyError
+        :param su: if True, return also an array of standard uncertainties
+        :return: array with value of `self[key]`, tuple of arrays if `su`,
+            or `default` if `key` is missing.
+        """
+        value = self.get(key)
+        if value is None:
+            return default
+        if not isinstance(value, (str, list)):
+            raise TypeError(f'Unknown value type of {value}: {type(value)}')
+        shape = () if isinstance(value, str) else (len(value), )
+        dtype = np.dtype(dtype)
+        if np.issubdtype(dtype, np.floating) or su:
+            values, sus = cfloats_with_su(value)
+            values = values.astype(dtype).reshape(shape)
+            return (values, sus.reshape(shape)) if su else values
+        if np.issubdtype(dtype, np.integer):
+            return np.array(list(map(int, np.atleast_1d(value))),
+                            dtype=dtype).reshape(shape)
+        return np.array(value, dtype=dtype)
+
+    def get_as_structured_array(
+            self,
+            keys: Sequence[str],
+            dtypes: dict[str, Union[type, np.dtype, str]] = None,
+            su: bool = False,
+    ) -> np.ndarray:
+        """
+        Get values of several loop `keys` at once as a structured array.
+        Every key becomes a field named after it, converted using
+        `get_as_array` to the type given in `dtypes` (by default float).
+        If `su`, floating-point fields are accompanied by a field with their
+        standard uncertainties, named after the key with "_su" suffix.
+
+        :param keys: keys associated with accessed loop columns
+        :param dtypes: dict mapping some or all `keys` to their output types
+        :param su: if True, include fields with standard uncertainties
+        :return: structured array with one record for every loop row
+        """
+        dtypes = {} if dtypes is None else dtypes
+        columns = {}
+        for key in keys:
+            dtype = np.dtype(dtypes.get(key, float))
+            if key not in self:
+                raise KeyError(key)
+            if su and np.issubdtype(dtype, np.floating):
+                columns[key], columns[key + '_su'] = \
+                    self.get_as_array(key, dtype, su=True)
+            else:
+                columns[key] = self.get_as_array(key, dtype)
+        lengths = {np.size(c) for c in columns.values()}
+        if len(lengths) > 1:
+            raise ValueError(f'Columns of {keys} have different lengths')
+        records = np.empty(lengths.pop() if lengths else 0,
+                           dtype=[(k, c.dtype) for k, c in columns.items()])
+        for k, c in columns.items():
+            records[k] = c
+        return records
+
+    def read(self, path: str, block: str, persist_index: bool = False) -> None:
         """
         Read the contents of .cif file specified by the `path` parameter, but
-        access and store only the `block` data block in self.
+        access and store only the `block` data block in self. Only the block
+        itself is parsed; it is located using an index of block headers.
 
         :param path: Absolute or relative path to the .cif file.
         :param block: Name of the cif data block to be accessed
+        :param persist_index: If True, save the index of blocks beside
+            the file and re-use it as long as the file does not change.
         """
         reader = CifReader(cif_file_path=path)
-        self.update(reader.read()[block])
+        self.update(reader.read_block(block, persist_index=persist_index))
 
-    def write(self, path: str) -> None:
+    def write(self, path: str, append: bool = False) -> None:
         """
         Write the contents of `CifBlock` to the .cif file specified
         by the `path` parameter, using 'hikari' as block name.
+        If `append`, add the items to the end of the last block in the file
+        instead, keeping the persisted index of blocks up to date.
 
         :param path: Absolute or relative path to the .cif file.
+        :param append: If True, append the items to the existing file.
         """
         writer = CifWriter(cif_file_path=path)
-        writer.write(cif_frame=CifFrame({'hikari': self}))
+        if append:
+            writer.write_items(cif_block=self)
+        else:
+            writer.write(cif_frame=CifFrame({'hikari': self}))
 
 
 class CifFrame(UserDict):
@@ -83,25 +173,126 @@ class CifFrame(UserDict):
     any parameters at creation.
     """
 
-    def read(self, path: str) -> None:
+    def __getitem__(self, key: str) -> 'CifBlock':
+        value = super().__getitem__(key)
+        if isinstance(value, _LazyCifBlock):
+            value = self.data[key] = value.load()
+        return value
+
+    def read(
+            self,
+            path: str,
+            blocks: Iterable[str] = None,
+            lazy: bool = False,
+            persist_index: bool = False,
+    ) -> None:
         """
         Read the contents of .cif file specified by the `path` parameter.
         Store each found block as a {block_name: CifBlock} pair.
 
         :param path: Absolute or relative path to the .cif file.
+        :param blocks: If given, read and store only blocks with these names.
+        :param lazy: If True, index the blocks but parse each of them
+            only on first access. The file should not change in the meantime.
+        :param persist_index: If True, save the index of blocks beside
+            the file and re-use it as long as the file does not change.
         """
         reader = CifReader(cif_file_path=path)
-        self.update(reader.read())
+        if blocks is None and not lazy:
+            self.update(reader.read())
+            return
+        index = reader.block_index(persist=persist_index)
+        names = index.keys() if blocks is None else blocks
+        for name in names:
+            lazy_block = _LazyCifBlock(reader, *index[name][1:])
+            self.data[name] = lazy_block if lazy else lazy_block.load()
+
+    @classmethod
+    def read_many(
+            cls,
+            paths: Iterable[str],
+            workers: int = None,
+            blocks: Iterable[str] = None,
+            columns: dict[str, Union[type, np.dtype, str]] = None,
+    ) -> tuple[dict[str, Union['CifFrame', dict]], dict[str, Exception]]:
+        """
+        Read many .cif files specified in `paths` using a pool of `workers`
+        processes. Every worker prepares the cif core validator only once.
+        Exceptions raised while reading individual files do not abort
+        the process, but are collected and returned for every file instead.
+
+        :param paths: Absolute or relative paths to the .cif files.
+        :param workers: Number of processes to use; by default all CPUs.
+            If 1, read all files in the current process instead.
+        :param blocks: If given, read only blocks with these names.
+        :param columns: If given, instead of a `CifFrame` return for every
+            file a {block_name: {key: array}} dict with values of these keys
+            converted to given dtype, see :meth:`CifBlock.get_as_array`.
+        :return: a {path: `CifFrame` or dict} dict of successfully read files
+            and a {path: exception} dict of files which could not be read.
+        """
+        paths = [str(path) for path in paths]
+        blocks = None if blocks is None else list(blocks)
+        args = ([blocks] * len(paths), [columns] * len(paths))
+        workers = workers or os.cpu_count() or 1
+        if workers == 1:
+            outcomes = list(map(_read_cif_file, paths, *args))
+        else:
+            chunk_size = max(1, len(paths) // (4 * workers))
+            with ProcessPoolExecutor(max_workers=workers,
+                                     initializer=get_cif_core_validator) as ex:
+                outcomes = list(ex.map(_read_cif_file, paths, *args,
+                                       chunksize=chunk_size))
+        read, failed = {}, {}
+        for path, (result, error) in zip(paths, outcomes):
+            if error is None:
+                read[path] = result
+            else:
+                failed[path] = error
+        return read, failed
 
-    def write(self, path: str) -> None:
+    def write(self, path: str, append: bool = False) -> None:
         """
         Write the contents of `CifFrame` to the .cif file specified
-        by the `path` parameter.
+        by the `path` parameter. If `append`, add the blocks to the end
+        of the file without reading it, keeping the persisted index of blocks
+        up to date, see :meth:`CifReader.block_index`.
 
         :param path: Absolute or relative path to the .cif file.
+        :param append: If True, append the blocks to the existing file.
         """
         writer = CifWriter(cif_file_path=path)
-        writer.write(cif_frame=self)
+        writer.write(cif_frame=self, append=append)
+
+
+def _read_cif_file(
+        path: str,
+        blocks: Iterable[str] = None,
+        columns: dict[str, Union[type, np.dtype, str]] = None,
+) -> tuple[Union[CifFrame, dict, None], Union[Exception, None]]:
+    """Read a single file for `CifFrame.read_many`; return result, error"""
+    try:
+        frame = CifFrame()
+        frame.read(path, blocks=blocks)
+        if columns is None:
+            return frame, None
+        return {name: {k: block.get_as_array(k, dtype)
+                       for k, dtype in columns.items() if k in block}
+                for name, block in frame.items()}, None
+    except Exception as e:
+        return None, e
+
+
+class _LazyCifBlock:
+    """Location of a not-yet-parsed block, to be parsed by `CifFrame` later"""
+
+    def __init__(self, reader: 'CifReader', start: int, end: int) -> None:
+        self.reader = reader
+        self.start = start
+        self.end = end
+
+    def load(self) -> CifBlock:
+        return self.reader.read_span(self.start, self.end)
 
 
 class CifValidator(UserDict):
@@ -109,26 +300,63 @@ class CifValidator(UserDict):
     This object is used to validate individual cif keys when parsing cif files.
     It knows the metadata about each key based on its entry
     in the cif core dictionary v.2.4.5 packaged with the project.
-    Since the specification itself is written in cif format,
-    it is also read using the same `CifReader` (but without `CifValidator`).
 
     Upon initialization, `CifValidator` becomes a dictionary whose
     keys are all valid cif keys, according to the cif specification used.
     Individual values are themselves dictionaries that store information
     about key's contents, `_category`, `_type`, whether they are a `_list` etc.
+    Only these `INDEX_FIELDS` are loaded from a compact, precompiled index
+    packaged alongside the dictionary. If the index is missing or corrupt,
+    the specification itself, written in cif format, is read instead
+    using the same `CifReader` (but without `CifValidator`).
 
     contains all keys from core cif dictionary. In order
     to access individual values, use `.get()` instead of bracket notation.
     """
 
+    INDEX_FIELDS = ('_name', '_category', '_type', '_type_conditions', '_list')
+
     def __init__(self) -> None:
+        self._entries_by_name: dict[str, CifBlock] = {}
         super().__init__()
+        try:
+            index = json.loads(resources.cif_core_index_json)
+        except (OSError, TypeError, ValueError):
+            index = self.compile_index(self.read_dictionary())
+        self.update({k: CifBlock(v) for k, v in index.items()})
+
+    @staticmethod
+    def read_dictionary() -> dict[str, 'CifBlock']:
+        """Read all entries of the cif core dictionary in their full form"""
         with tempfile.TemporaryDirectory() as temp_dir:
             temp_dic_path = str(pathlib.Path(temp_dir) / 'cif_core.dic')
             with open(temp_dic_path, 'w+') as f:
-                f.write(cif_core_dict)
+                f.write(resources.cif_core_dict)
             reader = CifReader(cif_file_path=temp_dic_path, validate=False)
-            self.update(reader.read())
+            return reader.read()
+
+    @classmethod
+    def compile_index(cls, dictionary: dict[str, 'CifBlock']) -> dict[str, dict]:
+        """Reduce dictionary entries to `INDEX_FIELDS`, skipping empty ones"""
+        index = {}
+        for entry_name, entry in dictionary.items():
+            indexed = {k: entry[k] for k in cls.INDEX_FIELDS if k in entry}
+            if indexed.get('_name'):
+                index[entry_name] = indexed
+        return index
+
+    def __setitem__(self, key: str, value: UserDict) -> None:
+        """Set the entry and index every `_name` it defines under `key`"""
+        super().__setitem__(key, value)
+        for name in value.get('_name', None) or []:
+            if name[1:].startswith(key):
+                self._entries_by_name[name] = value
+
+    def __delitem__(self, key: str) -> None:
+        super().__delitem__(key)
+        self._entries_by_name = {}
+        for self_key, self_value in self.data.items():
+            self.__setitem__(self_key, self_value)
 
     def __contains__(self, item) -> bool:
         try:
@@ -139,20 +367,16 @@ class CifValidator(UserDict):
             return True
 
     def get(self, key: str, default: UserDict = None) -> UserDict:
-        """Get the dictionary containing information about input cif `key`."""
-        # def get(self, key: str, default: Any = str) -> UserDict: FAILED
+        """
+        Get the dictionary containing information about input cif `key`.
+        Look for an entry named `key` first, then for the entry which lists
+        `key` among its `_name`s, using the index maintained on assignment.
+        """
         key, _key = (key[1:], key) if key.startswith('_') else (key, '_' + key)
-        value = UserDict()
-        try:
-            value = self[key]
-        except KeyError as e:
-            for self_key, self_value in self.items():
-                if key.startswith(self_key):
-                    if _key in self_value.get('_name', []):
-                        value = self_value
-            if not value:
-                value = default
-        return value
+        value = self.data.get(key)
+        if value is None:
+            value = self._entries_by_name.get(_key)
+        return default if value is None else value
 
     def get__category(self, key: str, default: str = None) -> str:
         """Close equivalent to `self.get(key).get('_category', default)`"""
@@ -201,19 +425,9 @@ class CifIO(abc.ABC):
     base on the IUCr File Syntax version 1.1 Working specification available
     [here](`https://www.iucr.org/resources/cif/spec/version1.1/cifsyntax`)
     """
-    COMMENT_REGEX = \
-        re.compile(r"(?<=\s)(#.*)(?=$)|(?<=^)(#.*)(?=$)", flags=re.M)
-    MATCHING_QUOTES_REGEX = re.compile(r"(\B[\"'])((?:\\\1|(?!\1\s).)*.)(\1\B)")
-    MATCHING_OUTER_DELIMITERS_REGEX = \
-        re.compile(r"(?<=^)([\"';])([\S\s]*)(\1)(?=$)")
-    MULTILINE_QUOTE_REGEX = re.compile(r"(^;)([\S\s]*?)(\n;)", flags=re.M)
-
-    WHITESPACE_SUBSTITUTES = {' ': '█', '\t': '▄', '\n': '▀'}
 
     def __init__(self, cif_file_path, validate=True):
-        self.file_contents = ''
         self.file_path = make_abspath(cif_file_path)
-        self.file_lines = []
         self.validate = validate
 
 
@@ -224,14 +438,26 @@ class CifReaderBuffer(CifIOBuffer):
         super().__init__(target=target)
         self.target: dict = target
 
-    def add(self, word: str) -> None:
+    def add(self, word: str, delimited: bool = False) -> None:
         """Append the word to names or values based on its first char"""
-        if word.startswith('_'):
+        if word.startswith('_') and not delimited:
             if self.values:
                 self.flush()
             self.names.append(word)
         else:
-            self.values.append(CifReader.revert_delimiters_and_whitespace(word))
+            self.values.append(word)
+
+    def add_many(self, words: list[str], delimited: list[bool] = None) -> None:
+        """Append many words at once, quickly if none of them is a data name"""
+        if delimited is None:
+            if ' _' not in ' ' + ' '.join(words):
+                self.values.extend(words)
+            else:
+                for word in words:
+                    self.add(word)
+        else:
+            for word, word_delimited in zip(words, delimited):
+                self.add(word, word_delimited)
 
     def flush(self) -> None:
         """Update the target dict with names and values stored hitherto"""
@@ -260,14 +486,133 @@ class CifReader(CifIO):
     :class:`~.CifFrame` or :class:`~.CifBlock`.
     """
 
+    TOKEN_REGEX = re.compile(r"""(#.*)|'(.*?)'(?=\s|$)|"(.*?)"(?=\s|$)|(\S+)""")
+    TOKEN_SPECIAL_CHARACTERS = ('#', "'", '"')
+
+    INDEX_SUFFIX = '.index.json'
+
     @property
     def blocks(self) -> dict[str, int]:
         """A dict of block names:line numbers where they start in cif file."""
-        return self._blocks(lines=tuple(self.file_lines))
+        return {n: i[0] for n, i in self.block_index().items()}
 
-    @lru_cache(maxsize=1)
-    def _blocks(self, lines: Sequence[str]) -> dict[str, int]:
-        return {l[5:]: i for i, l in enumerate(lines) if l.startswith('data_')}
+    @property
+    def index_path(self) -> pathlib.Path:
+        """Path where the index of blocks in the file can be persisted"""
+        return pathlib.Path(str(self.file_path) + self.INDEX_SUFFIX)
+
+    BLOCK_SCAN_REGEX = re.compile(rb'^(?:;|data_([^\r\n]*))', flags=re.M)
+
+    def _scan_block_index(
+            self,
+            offset: int = 0,
+            line: int = 0,
+            open_block: tuple[str, tuple[int, int, int]] = None,
+    ) -> dict[str, tuple[int, int, int]]:
+        """
+        Scan memory-mapped file for headers outside of text fields.
+        If `offset` is given, start the scan at this byte and `line`,
+        and if `open_block` name and span is given, continue this block.
+        """
+        index = {}
+        name, header_line, start = None, 0, 0
+        if open_block is not None:
+            name, (header_line, start, _) = open_block
+        position = offset
+        in_text_field = False
+        with open(self.file_path, 'rb') as cif_file:
+            if os.fstat(cif_file.fileno()).st_size <= offset:
+                if name is not None:
+                    index[name] = (header_line, start, offset)
+                return index
+            with mmap.mmap(cif_file.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                for match in self.BLOCK_SCAN_REGEX.finditer(mm, offset):
+                    if match.group(1) is None:
+                        in_text_field = not in_text_field
+                        continue
+                    if in_text_field:
+                        continue
+                    line += mm[position:match.start()].count(b'\n')
+                    position = match.start()
+                    if name is not None:
+                        index[name] = (header_line, start, match.start())
+                    name = match.group(1).decode()
+                    header_line = line
+                    start = mm.find(b'\n', match.end()) + 1 or len(mm)
+                if name is not None:
+                    index[name] = (header_line, start, len(mm))
+        return index
+
+    def _signature(self) -> list[int]:
+        """Size and modification time used to recognise an unchanged file"""
+        stat = pathlib.Path(self.file_path).stat()
+        return [stat.st_size, stat.st_mtime_ns]
+
+    def _load_block_index(self) -> Union[dict[str, tuple[int, int, int]], None]:
+        """Return index persisted at `index_path` if still valid, or None"""
+        try:
+            with open(self.index_path, 'r') as index_file:
+                persisted = json.load(index_file)
+            if persisted['signature'] == self._signature():
+                return {k: tuple(v) for k, v in persisted['blocks'].items()}
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+        return None
+
+    def _save_block_index(self, index: dict[str, tuple[int, int, int]]) -> None:
+        """Persist the `index` at `index_path` with current file signature"""
+        with open(self.index_path, 'w') as index_file:
+            json.dump({'signature': self._signature(), 'blocks': index},
+                      index_file)
+
+    def block_index(self, persist: bool = False) \
+            -> dict[str, tuple[int, int, int]]:
+        """
+        Return a dict with every block name as key, and a tuple with its
+        header's line number as well as its first and past-the-end byte
+        as value. The index is built by a single scan of the file,
+        or loaded from :attr:`index_path` if it was persisted before
+        and the size and modification time of the file did not change.
+
+        :param persist: If True, save the index at :attr:`index_path`.
+        :return: dict with block name: (line number, start, end byte) pairs.
+        """
+        index = self._load_block_index()
+        if index is not None:
+            return index
+        index = self._scan_block_index()
+        if persist:
+            self._save_block_index(index)
+        return index
+
+    def extend_block_index(
+            self,
+            index: dict[str, tuple[int, int, int]],
+            offset: int,
+    ) -> dict[str, tuple[int, int, int]]:
+        """
+        Extend the `index` of the file as it was when it was `offset` bytes
+        long with the contents appended since then, and persist it
+        at :attr:`index_path`. Only the appended bytes and the last block
+        of the file are read to do so.
+
+        :param index: Index of the file before anything was appended to it.
+        :param offset: Size of the file before anything was appended to it.
+        :return: dict with block name: (line number, start, end byte) pairs.
+        """
+        index = dict(index)
+        open_block = None
+        if index:
+            open_block = max(index.items(), key=lambda item: item[1][1])
+            del index[open_block[0]]
+        line_start, byte_start = (open_block[1][0] + 1, open_block[1][1]) \
+            if open_block else (0, 0)
+        with open(self.file_path, 'rb') as cif_file:
+            cif_file.seek(byte_start)
+            line = line_start + cif_file.read(offset - byte_start).count(b'\n')
+        index.update(self._scan_block_index(offset, line, open_block))
+        self._save_block_index(index)
+        return index
 
     class State(Enum):
         """This class stores current cif reading state (e.g. inside loop etc.)"""
@@ -275,6 +620,48 @@ class CifReader(CifIO):
         loop_keys = 1
         loop_values = 2
 
+    @classmethod
+    def tokenize(cls, lines: Iterable[str]) \
+            -> Iterator[tuple[list[str], Union[list[bool], None]]]:
+        """
+        Split cif `lines` into words in a single pass. Text fields delimited
+        by semicolons at line start are joined with the line they start at,
+        outer quotes and semicolons are removed, and comments are skipped.
+        For every logical line, yield a list of its words and a list
+        of bools, True for delimited words (which can not be data names),
+        or None if no word in given line was delimited.
+
+        :param lines: Iterable with lines of cif file, e.g. a file object
+        :return: Iterator over words and their delimitation in every line
+        """
+        lines = iter(lines)
+        for line in lines:
+            words, delimited = [], None
+            if line.startswith(';'):
+                text = [line[1:].rstrip('\r\n')]
+                for line in lines:
+                    if line.startswith(';'):
+                        break
+                    text.append(line.rstrip('\r\n'))
+                else:
+                    line = ''
+                words, delimited = ['\n'.join(text)], [True]
+                line = line[1:]
+            if not any(c in line for c in cls.TOKEN_SPECIAL_CHARACTERS):
+                words.extend(line.split())
+                if delimited is not None:
+                    delimited.extend([False] * (len(words) - 1))
+                yield words, delimited
+                continue
+            delimited = delimited or [False] * len(words)
+            for match in cls.TOKEN_REGEX.finditer(line):
+                group = match.lastindex
+                if group == 1:
+                    break
+                words.append(match.group(group))
+                delimited.append(group != 4)
+            yield words, delimited
+
     def format_dictionary(self, parsed_dict_: dict[str, list[str]]) \
             -> dict[str, Union[str, list[str]]]:
         """
@@ -286,7 +673,7 @@ class CifReader(CifIO):
         """
 
         def item_value_should_be_a_list(k_, v_):
-            is_listable = cif_core_validator.get__list(k_) \
+            is_listable = get_cif_core_validator().get__list(k_) \
                 if self.validate else False
             is_long = len(v_) > 1
             is_a_validator_name_field = not self.validate and k_ == '_name'
@@ -300,107 +687,108 @@ class CifReader(CifIO):
                 new_dict[k] = v[0]
         return new_dict
 
-    def parse_lines(self, start: int, end: int) -> dict:
+    def parse_lines(self, lines: Iterable[str]) -> dict:
         """
-        Read the data from :attr:`~.CifIO.lines` numbered `start` to `end`,
-        interpret it, and return it as an instance of a dict.
+        Read the data from `lines` of a single data block (without its
+        header), interpret it, and return it as an instance of a dict.
 
-        :param start: number of the first line which data should be read from
-        :param end: number of the first line which should not be read anymore
+        :param lines: Iterable with lines of a data block, e.g. a file slice
         :return: ordered dictionary with name: value pairs for all parsed lines
         """
         parsed_data = dict()
         buffer = CifReaderBuffer(target=parsed_data)
         state = self.State.default
-        for line in self.file_lines[start:end]:
-            if line.lstrip().startswith('loop_'):
+        for words, delimited in self.tokenize(lines):
+            if words and words[0].startswith('loop_') \
+                    and not (delimited and delimited[0]):
                 buffer.flush()
                 state = self.State.loop_keys
-                line = line.lstrip()[5:]
-            words = line.strip().split()
+                words[0] = words[0][5:]
+                if not words[0]:
+                    del words[0]
+                    delimited = delimited[1:] if delimited else delimited
             if not words:
                 if state is self.State.loop_values:
                     state = self.State.default
                 continue
-            if words[0].startswith('_') and state is not self.State.loop_keys:
+            is_name = words[0].startswith('_') and not (delimited and delimited[0])
+            if is_name and state is not self.State.loop_keys:
                 buffer.flush()
-            if not words[0].startswith('_') and state is self.State.loop_keys:
+            if not is_name and state is self.State.loop_keys:
                 state = self.State.loop_values
-            for word in words:
-                buffer.add(word)
+            buffer.add_many(words, delimited)
         buffer.flush()
         formatted_data = self.format_dictionary(parsed_data)
         return formatted_data
 
+    def _iter_blocks(self, lines: Iterable[str]) \
+            -> Iterator[tuple[str, Iterator[str]]]:
+        """
+        Yield the name and an iterator over lines of every block in `lines`.
+        Block lines are consumed lazily, so each must be exhausted in turn.
+        """
+        lines = iter(lines)
+        header = next((line for line in lines if line.startswith('data_')), None)
+        while header is not None:
+            next_header = []
+
+            def block_lines() -> Iterator[str]:
+                in_text_field = False
+                for line in lines:
+                    if line.startswith(';'):
+                        in_text_field = not in_text_field
+                    elif line.startswith('data_') and not in_text_field:
+                        next_header.append(line)
+                        return
+                    yield line
+            yield header[5:].rstrip('\r\n'), block_lines()
+            header = next_header[0] if next_header else None
+
+    def parse(self, lines: Iterable[str]) -> dict:
+        """
+        Interpret `lines` of a complete cif document, e.g. a file object or
+        contents of a text field, and return all of its data blocks in a dict.
+        Lines are consumed lazily and tokenized in a single pass.
+
+        :param lines: Iterable with lines of a cif document
+        :return: A dictionary containing information parsed from `lines`.
+        """
+        return {block_name: CifBlock(self.parse_lines(block_lines))
+                for block_name, block_lines in self._iter_blocks(lines)}
+
     def read(self) -> dict:
         """
         Read the contents of cif currently pointed by :attr:`~.CifIO.file_path`
-        and block :attr:`~.CifIO.data_block_header` and return them to a dict.
+        and return all of its data blocks in a dict. The file is read lazily
+        and tokenized in a single pass, without being kept in the memory.
 
         :return: A dictionary containing information read from .cif file.
         """
         with open(self.file_path, 'r') as cif_file:
-            self.file_contents = cif_file.read()
-        self.protect_multilines()
-        self.protect_quotes()
-        self.remove_comments()
-        self.file_lines = self.file_contents.splitlines()
-        block_names = self.blocks.keys()
-        block_starts = self.blocks.values()
-        block_ends = list(block_starts)[1:] + [None]
-        read_data = {}
-        for n, s, e in zip(block_names, block_starts, block_ends):
-            read_data[n] = CifBlock(self.parse_lines(s + 1, e))
-        return read_data
+            return self.parse(cif_file)
 
-    def protect_multilines(self) -> None:
-        """
-        Replace whitespace between every pair of "\\n;" sequences with
-        substitutes and remove the outer semicolons in `self.file_contents`.
+    def read_span(self, start: int, end: int) -> 'CifBlock':
         """
+        Parse the block stored between `start` and `end` byte of the file.
 
-        split_string = self.MULTILINE_QUOTE_REGEX.split(self.file_contents)
-        self.file_contents = self._protect_split(split_string)
-
-    def protect_quotes(self) -> None:
-        """
-        Replace whitespace between every pair of matching quotation marks
-        (single or double) with substitutes and remove the outer quotation
-        marks in `self.contents`. See stack overflow /q/46967465/ for details.
+        :param start: first byte of block contents, right after its header
+        :param end: past-the-end byte of block contents
+        :return: A `CifBlock` with information read from given file span.
         """
-        split_string = self.MATCHING_QUOTES_REGEX.split(self.file_contents)
-        self.file_contents = self._protect_split(split_string)
-
-    @classmethod
-    def _protect_split(cls, split_string: list[str]) -> str:
-        quoted = split_string[2::4]
-        for ws, sub in cls.WHITESPACE_SUBSTITUTES.items():
-            quoted = [w.replace(ws, sub) for w in quoted]
-        right_delimiters = [w.strip('\n') for w in split_string[3::4]]
-        split_string[2::4] = quoted
-        split_string[3::4] = right_delimiters
-        a = ''.join(split_string)
-        return ''.join(split_string)
+        with open(self.file_path, 'rb') as cif_file:
+            cif_file.seek(start)
+            contents = cif_file.read(end - start)
+        return CifBlock(self.parse_lines(io.TextIOWrapper(io.BytesIO(contents))))
 
-    def remove_comments(self) -> None:
-        """
-        Replace all comment blocks (whitespace or start-of-file followed by "#")
-        within `self.file_contents` with empty strings.
+    def read_block(self, block: str, persist_index: bool = False) -> 'CifBlock':
         """
-        self.file_contents = self.COMMENT_REGEX.sub('', self.file_contents)
+        Read and parse only a single `block` of cif, located using an index.
 
-    @classmethod
-    def revert_delimiters_and_whitespace(cls, string: str) -> str:
+        :param block: Name of the cif data block to be read.
+        :param persist_index: If True, persist the index, see `block_index`.
+        :return: A `CifBlock` with information read from given block.
         """
-        If present, remove outer delimiters (matching quotes or semicolons) from
-        supplied string, remove `self.WHITESPACE_SUBSTITUTES` and return string.
-
-        :return: `string` without outer delimiters nor whitespace substitutes.
-        """
-        s = ''.join(cls.MATCHING_OUTER_DELIMITERS_REGEX.split(string)[::2])
-        for whitespace, substitute in cls.WHITESPACE_SUBSTITUTES.items():
-            s = s.replace(substitute, whitespace)
-        return s
+        return self.read_span(*self.block_index(persist=persist_index)[block][1:])
 
 
 class CifWriterBuffer(CifIOBuffer):
@@ -410,6 +798,7 @@ class CifWriterBuffer(CifIOBuffer):
     MAX_LINE_LENGTH = 80
     MIN_STEP_LENGTH = 2
     WHITESPACE = {' ', '\t', '\n'}
+    TABLE_CHUNK_ROWS = 10_000
 
     def __init__(self, target: TextIO) -> None:
         super().__init__(target=target)
@@ -420,15 +809,19 @@ class CifWriterBuffer(CifIOBuffer):
 
     def add(self, data: tuple) -> None:
         k_, v_ = data
-        k__category = cif_core_validator.get__category(k_)
-        k__list = cif_core_validator.get__list(k_) or isinstance(v_, list)
-        v_len = len(v_) if isinstance(v_, list) else 0
+        if isinstance(v_, np.ndarray) and v_.ndim == 0:
+            v_ = str(v_.item())
+        validator = get_cif_core_validator()
+        k__category = validator.get__category(k_)
+        v_is_column = isinstance(v_, (list, np.ndarray))
+        k__list = validator.get__list(k_) or v_is_column
+        v_len = len(v_) if v_is_column else 0
 
         cat_match = self.current__category == k__category
         lis_match = self.current__list == k__list
         len_match = self.current_len == v_len
         start_match = k_[:12] == ['', *self.names][-1][:12]
-        entry_missing = cif_core_validator.get(k_) is None
+        entry_missing = validator.get(k_) is None
 
         if len_match and ((cat_match and lis_match) or
                           (entry_missing and start_match)):
@@ -443,38 +836,79 @@ class CifWriterBuffer(CifIOBuffer):
             self.current_len = v_len
 
     def flush(self) -> None:
-        s = '\n'
-        if self.current__list is True:
-            s += self.format_table()
+        if self.current__list is True and self.names:
+            self.target.write('\n')
+            for chunk in self.format_table():
+                self.target.write(chunk)
         else:
+            s = '\n'
             for n_, v_ in zip(self.names, self.values):
                 s += self.format_line(n_, v_) + '\n'
-        self.target.write(s)
+            self.target.write(s)
         self.names = []
         self.values = []
 
     def format_line(self, k, v) -> str:
+        v = str(v)
         name_string = f'{k:<{self.MAX_NAME_LENGTH}}'
         step_string = ' ' * self.MIN_STEP_LENGTH
         value_string = self.enquote(v)
         if len(name_string + step_string + value_string) > self.MAX_LINE_LENGTH:
             step_string = '\n '
-            value_string = self.enquote(v, force=True)
+            if value_string is v:
+                value_string = self.enquote(v, force=True)
         if value_string.startswith(';'):
             step_string = '\n'
         return name_string + step_string + value_string
 
-    def format_table(self) -> str:
-        column_widths = [max(map(len, v)) for v in self.values]
-        if sum(column_widths) + len(column_widths) >= self.MAX_LINE_LENGTH:
-            pass  # TODO: break long loop tables rows into multiple
-        formatted_string = 'loop_\n'
-        for name in self.names:
-            formatted_string += f' {name}\n'
-        for value_row in list(map(list, zip(*self.values))):
-            enquoted_value_row = map(self.enquote, value_row)
-            formatted_string += f' {" ".join(enquoted_value_row)}\n'
-        return formatted_string
+    def format_table(self) -> Iterator[str]:
+        """
+        Yield the loop with current names and values in chunks of at most
+        `TABLE_CHUNK_ROWS` rows. Columns are enquoted as a whole. Rows longer
+        than `MAX_LINE_LENGTH` are wrapped, keeping columns of every row
+        on the same lines. Text fields are always placed on separate lines.
+        """
+        yield 'loop_\n' + ''.join(f' {name}\n' for name in self.names)
+        columns = [self.enquote_column([v] if isinstance(v, str) else v)
+                   for v in self.values]
+        lines_columns = [[]]
+        line_length = 0
+        for column in columns:
+            width = max(map(len, column), default=0) + 1
+            if lines_columns[-1] and line_length + width > self.MAX_LINE_LENGTH:
+                lines_columns.append([])
+                line_length = 0
+            lines_columns[-1].append(column)
+            line_length += width
+        n_rows = max(map(len, columns), default=0)
+        for beg in range(0, n_rows, self.TABLE_CHUNK_ROWS):
+            end = beg + self.TABLE_CHUNK_ROWS
+            lines = [map(' '.join, zip(*[c[beg:end] for c in line_columns]))
+                     for line_columns in lines_columns]
+            yield ''.join(' ' + '\n '.join(row_lines) + '\n'
+                          for row_lines in zip(*lines))
+
+    def enquote_column(self, values: Union[list, np.ndarray]) -> list[str]:
+        """
+        Convert all `values` of a loop column to strings and enquote them
+        if needed. Numbers are never enquoted, and nan is written as "?".
+        Enquoted text fields are surrounded by line breaks.
+
+        :param values: column of strings or numbers, e.g. NumPy array
+        :return: list of strings ready to be written in a loop table
+        """
+        if isinstance(values, np.ndarray) and values.dtype.kind in 'iuf':
+            strings = list(map(str, values.tolist()))
+            if values.dtype.kind == 'f':
+                for i in np.flatnonzero(np.isnan(values)):
+                    strings[i] = '?'
+            return strings
+        values = list(map(str, values))
+        joined = ''.join(values)
+        if '' not in values and not any(w in joined for w in self.WHITESPACE):
+            return values
+        quoted = map(self.enquote, values)
+        return [f'\n{q}\n' if q.startswith(';') else q for q in quoted]
 
     def enquote(self, text: str, force: bool = False) -> str:
         if text == '':
@@ -501,18 +935,76 @@ class CifWriter(CifIO):
     into cif files
     """
 
-    def write(self, cif_frame: CifFrame) -> None:
-        with open(self.file_path, 'w') as cif_file:
+    BUFFER_SIZE = 2 ** 20
+
+    def write(self, cif_frame: CifFrame, append: bool = False) -> None:
+        """
+        Write all blocks of `cif_frame` into the cif file. If `append`,
+        add them to the end of the file instead of overwriting it.
+
+        :param cif_frame: A frame with {block_name: CifBlock} to be written.
+        :param append: If True, append new blocks after existing ones.
+        """
+        self._write(cif_frame.items(), append=append)
+
+    def write_items(self, cif_block: CifBlock) -> None:
+        """
+        Append all items of `cif_block` to the end of the last block
+        in the cif file. If the file is empty or does not exist,
+        write them in a new block named 'hikari' instead.
+
+        :param cif_block: A block with items to be appended to the file.
+        """
+        self._write([(None, cif_block)], append=True)
+
+    def _write(self, blocks: Iterable[tuple[Union[str, None], CifBlock]],
+               append: bool) -> None:
+        """
+        Write (name, block) pairs, where None name continues the last block.
+        When appending, update the index of blocks if it has been persisted,
+        without reading the existing part of the file.
+        """
+        reader = CifReader(cif_file_path=self.file_path)
+        index = reader._load_block_index() if append else None  # noqa
+        mode = 'a' if append else 'w'
+        with open(self.file_path, mode, buffering=self.BUFFER_SIZE) as cif_file:
+            offset = cif_file.tell()
+            empty = offset == 0
             buffer = CifWriterBuffer(target=cif_file)
-            first_block = True
-            for block_name, block in cif_frame.items():
-                if not first_block:
-                    cif_file.write('\n\n')
-                cif_file.write(f'data_{block_name}')
+            for block_name, block in blocks:
+                if block_name is None and empty:
+                    block_name = 'hikari'
+                if block_name is not None:
+                    if not empty:
+                        cif_file.write('\n\n')
+                    cif_file.write(f'data_{block_name}')
+                    empty = False
                 for data in block.items():
                     buffer.add(data)
                 buffer.flush()
-                first_block = False
+        if index is not None:
+            reader.extend_block_index(index, offset)
 
 
-cif_core_validator = CifValidator()
+@lru_cache(maxsize=1)
+def get_cif_core_validator() -> CifValidator:
+    """Create the `CifValidator` with cif core dictionary on first use only"""
+    return CifValidator()
+
+
+def __getattr__(name: str) -> Any:
+    if name == 'cif_core_validator':  # instantiated lazily, see PEP 562
+        return get_cif_core_validator()
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
+
+def regenerate_cif_core_index_json() -> None:
+    r"""
+    This function regenerates current `resources/cif_core_2.4.5.json`
+    index from the `.dic`. It should be run from hikari's parent directory
+    with hikari imported as module whenever `CifValidator.INDEX_FIELDS`
+    or the cif core dictionary are changed.
+    """
+    index = CifValidator.compile_index(CifValidator.read_dictionary())
+    with open(pathlib.Path('hikari/resources/cif_core_2.4.5.json'), 'w') as f:
+        json.dump(index, f, separators=(',', ':'))
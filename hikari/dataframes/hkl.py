@@ -8,6 +8,7 @@ import pandas as pd
 
 import hikari
 from hikari.dataframes import BaseFrame
+from hikari.dataframes.cif import CifBlock, CifReader
 from hikari.symmetry import PG, SG, Group
 from hikari.resources import hkl_formats, hkl_aliases, hkl_mercury_style, \
     characteristic_radiation
@@ -410,6 +411,83 @@ class HklFrame(BaseFrame):
         """
         return copy.deepcopy(self)
 
+    def _absence_patterns(self, space_groups: Iterable[Group]):
+        """
+        Evaluate systematic absence conditions of all `space_groups` at once.
+        Each absence condition is a pair of reciprocal rotation and glide:
+        reflection is absent if it is invariant under the former and its
+        phase shift from the latter is non-integer (see ITC-A12.3.5).
+
+        Whether a condition holds depends only on the set of rotations
+        reflection is invariant under and on its indices modulo 24.
+        Reflections sharing both share a "pattern", so the conditions,
+        including those shared by many groups, are evaluated once per pattern.
+        Returns an (N,) array with the pattern index of each reflection and
+        a (P, G) boolean array stating whether pattern is absent in group.
+
+        :param space_groups: Space groups whose conditions should be checked.
+        :type space_groups: Iterable[hikari.symmetry.group.Group]
+        :return: Reflection's pattern indices and pattern absence in groups
+        :rtype: tuple[np.ndarray, np.ndarray]
+        """
+        space_groups = list(space_groups)
+        if not space_groups:
+            return np.zeros(len(self.table), dtype=int), np.zeros((1, 0), bool)
+        group_ids = np.repeat(range(len(space_groups)),
+                              [g.order for g in space_groups])
+        rotations = np.vstack([g.reciprocal_rotations for g in space_groups])
+        glides = np.vstack([g.glides24 for g in space_groups]) % 24
+        conditions = np.hstack([rotations.reshape(-1, 9), glides])
+        conditions, condition_index = np.unique(conditions, axis=0,
+                                                return_inverse=True)
+        membership = np.zeros((len(space_groups), len(conditions)))
+        membership[group_ids, condition_index.ravel()] = 1
+        gliding = conditions[:, 9:].any(axis=1)  # no glide means no condition
+        conditions, membership = conditions[gliding], membership[:, gliding]
+        rotations, rot_index = np.unique(conditions[:, :9], axis=0,
+                                         return_inverse=True)
+        glides = conditions[:, 9:]
+        rotations = rotations.reshape(-1, 3, 3) - np.eye(3, dtype=int)
+        quadratic = np.einsum('rki,rkj->rij', rotations, rotations)
+        quadratic = np.stack([quadratic[:, 0, 0], quadratic[:, 1, 1],
+                              quadratic[:, 2, 2], 2 * quadratic[:, 0, 1],
+                              2 * quadratic[:, 0, 2], 2 * quadratic[:, 1, 2]])
+        quadratic = quadratic.astype(float)
+
+        def invariant_to_rotations(hkl_: np.ndarray) -> np.ndarray:
+            h, k, l_ = hkl_.T  # (R - I) hkl == 0 iff its squared norm is 0
+            monomials = np.stack([h * h, k * k, l_ * l_, h * k, h * l_, k * l_])
+            return (monomials.T @ quadratic) == 0
+
+        hkl = self.table.loc[:, ['h', 'k', 'l']].to_numpy(dtype=float)
+        chunk_size = hikari.MEMORY_SIZE // (16 * len(rotations) + 64)
+        words = []
+        for start in range(0, len(hkl), chunk_size):
+            invariant = invariant_to_rotations(hkl[start:start + chunk_size])
+            bits = np.packbits(invariant, axis=1, bitorder='little')
+            bits = np.pad(bits, ((0, 0), (0, -bits.shape[1] % 8)))
+            words.append(bits.view(np.uint64))
+        words = np.vstack(words) if words else np.zeros((0, 1), np.uint64)
+        modulus = 24 // np.gcd.reduce(glides.ravel(), initial=24)
+        pattern_code = (hkl.astype(np.int64) % modulus) \
+            @ np.array([modulus ** 2, modulus, 1])
+        code_span = modulus ** 3
+        for word in words.T:
+            word_values, word_code = np.unique(word, return_inverse=True)
+            pattern_code = pattern_code * len(word_values) + word_code.ravel()
+            code_span *= len(word_values)
+            if code_span > max(len(hkl), 2 ** 20):
+                pattern_code = np.unique(pattern_code, return_inverse=True)[1]
+                code_span = int(pattern_code.max(initial=0)) + 1
+        is_used = np.bincount(pattern_code.ravel(), minlength=code_span) > 0
+        pattern_index = (np.cumsum(is_used) - 1)[pattern_code.ravel()]
+        representatives = np.zeros((np.count_nonzero(is_used), 3))
+        representatives[pattern_index] = hkl  # any member represents pattern
+        invariant = invariant_to_rotations(representatives)
+        phased = (representatives @ glides.T) % 24 != 0
+        fulfilled = invariant[:, rot_index.ravel()] & phased
+        return pattern_index, (fulfilled @ membership.T) > 0
+
     def extinct(self, space_group: Group = SG['P1']):
         """
         Removes from dataframe reflections which should be extinct based on
@@ -418,12 +496,48 @@ class HklFrame(BaseFrame):
         :param space_group: Space group used to extinct the reflections.
         :type space_group: hikari.symmetry.group.Group
         """
-        hkls = self.table.loc[:, ['h', 'k', 'l']].to_numpy()
-        extinct_flag_list = [o.extincts(hkls) for o in space_group.operations]
-        extinct_flag_list_union = np.logical_or.reduce(extinct_flag_list)
-        self.table = self.table[~extinct_flag_list_union]
+        pattern_index, absent = self._absence_patterns([space_group])
+        extinct_flags = absent[pattern_index, 0]
+        self.table = self.table[~extinct_flags]
         self.table.reset_index(drop=True, inplace=True)
 
+    def screen_space_groups(self, laue_class: int = None) -> pd.DataFrame:
+        """
+        Score all space groups in `hikari.symmetry.SG` or, if `laue_class`
+        is given, only those belonging to Laue class with this number in
+        `hikari.symmetry.PG`, against observed systematic absences.
+        For each group, return the number of present reflections which should
+        be absent and their mean I/si(I). A correct space group should
+        predict few absences and those predicted should have low I/si(I).
+        All groups are scored in a single pass over the data.
+
+        :param laue_class: Number of Laue class in PG to limit screening to.
+        :type laue_class: int
+        :raises ValueError: if `laue_class` is not a number of Laue class.
+        :return: DataFrame with HM symbol, number of predicted absences and
+            their mean I/si(I) for each screened group, indexed by its n_c.
+        :rtype: pd.DataFrame
+        """
+        table = SG.table
+        if laue_class is not None:
+            table = table[table['laue_class'] == laue_class]
+            if table.empty:
+                laue_classes = sorted(set(SG.table['laue_class']))
+                raise ValueError(f'No space groups in Laue class {laue_class}'
+                                 f', use one of PG numbers: {laue_classes}')
+        pattern_index, absent = self._absence_patterns(table['group'])
+        i_to_si = (self.table['I'] / self.table['si']).to_numpy()
+        counts = np.bincount(pattern_index, minlength=len(absent))
+        sums = np.bincount(pattern_index, i_to_si, minlength=len(absent))
+        absent_counts = counts @ absent
+        absent_sums = sums @ absent
+        with np.errstate(divide='ignore', invalid='ignore'):
+            absent_means = absent_sums / absent_counts
+        return pd.DataFrame({'HM': table['HM'].to_numpy(),
+                             'Absent': absent_counts,
+                             'I/si(I)': absent_means},
+                            index=pd.Index(table['n_c'], name='n_c'))
+
     def find_equivalents(self, point_group: Group = PG['1']):
         """
         Assign each reflection its symmetry equivalence identifier and store
@@ -440,13 +554,125 @@ class HklFrame(BaseFrame):
         inc = 10 ** (int(np.log10(self.HKL_LIMIT)) + 2)
         equiv_dtype = HklKey.REGISTRY['equiv'].dtype
         self.table.reset_index(drop=True, inplace=True)
-        self.table['equiv'] = -inc**3
         _hkl_matrix = self.table.loc[:, ('h', 'k', 'l')].to_numpy()
-        for op in point_group.operations:
-            _new_hkl_matrix = op.transform(_hkl_matrix).astype(equiv_dtype)
-            new_equiv = _new_hkl_matrix @ np.array([inc ** 2, inc, 1])
-            _to_update = self.table['equiv'] < new_equiv
-            self.table.loc[_to_update, 'equiv'] = new_equiv[_to_update]
+        _hkl_matrix = _hkl_matrix.astype(equiv_dtype)
+        # equiv of op @ hkl is (op.T @ [inc^2, inc, 1]) @ hkl, so use weights
+        weights = point_group.rotations.transpose(0, 2, 1) \
+            @ np.array([inc ** 2, inc, 1], dtype=equiv_dtype)
+        equiv = np.full(len(_hkl_matrix), -inc ** 3, dtype=equiv_dtype)
+        for weight in weights:
+            np.maximum(equiv, _hkl_matrix @ weight, out=equiv)
+        self.table['equiv'] = equiv
+
+    def _subgroup_equivalents(self, hkl: np.ndarray, parent: Group,
+                              subgroups: list[Group]) -> np.ndarray:
+        """
+        Assign each reflection in `hkl` equivalence identifiers in each of
+        `subgroups` of `parent` point group. Images of reflections under the
+        parent are computed only once. Reflection's equivalence in parent is
+        given by its highest image "c", as in :meth:`find_equivalents`, and
+        set T of parent operations P which transform it into c. In subgroup
+        L, two reflections from the same parent orbit are equivalent if their
+        sets T * L of products of P_t @ L_l are equal, so the lowest index of
+        operation in T * L, precomputed for every T, identifies it uniquely.
+
+        :param hkl: Array of shape (N, 3) with integer reflection indices.
+        :type hkl: np.ndarray
+        :param parent: Point group containing all `subgroups`.
+        :type parent: hikari.symmetry.Group
+        :param subgroups: Point groups to calculate equivalence in.
+        :type subgroups: list[hikari.symmetry.Group]
+        :return: Array of shape (N, len(subgroups)) with equivalence ids
+            in range from 0 to the number of parent orbits times its order
+        :rtype: np.ndarray
+        """
+        inc = 10 ** (int(np.log10(self.HKL_LIMIT)) + 2)
+        equiv_dtype = HklKey.REGISTRY['equiv'].dtype
+        weights = parent.rotations.transpose(0, 2, 1) \
+            @ np.array([inc ** 2, inc, 1], dtype=float)  # exact, fast BLAS
+        hkl = np.asarray(hkl, dtype=float)
+        codes = np.empty(len(hkl), dtype=equiv_dtype)
+        patterns = np.empty(len(hkl), dtype=np.uint64)
+        chunk_size = hikari.MEMORY_SIZE // (16 * parent.order)
+        for start in range(0, len(hkl), chunk_size):
+            images = hkl[start:start + chunk_size] @ weights.T
+            code = images.max(axis=1, initial=-inc ** 3)
+            bits = np.packbits(images == code[:, None], axis=1, bitorder='little')
+            bits = np.pad(bits, ((0, 0), (0, 8 - bits.shape[1])))
+            codes[start:start + chunk_size] = code
+            patterns[start:start + chunk_size] = bits.view(np.uint64).ravel()
+        orbit_ids = np.unique(codes, return_inverse=True)[1].ravel()
+        pattern_values, pattern_ids = np.unique(patterns, return_inverse=True)
+        pattern_bits = np.unpackbits(pattern_values[:, None].view(np.uint8),
+                                     axis=1, bitorder='little')
+        pattern_bits = pattern_bits[:, :parent.order].astype(bool)
+
+        parent_ops = {r.tobytes(): i for i, r in enumerate(parent.rotations)}
+        products = np.einsum('tij,ljk->tlik', parent.rotations, parent.rotations)
+        products = np.array([[parent_ops[p.tobytes()] for p in row]
+                             for row in products])
+        equiv = np.empty((len(hkl), len(subgroups)), dtype=equiv_dtype)
+        for s, subgroup in enumerate(subgroups):
+            in_subgroup = [parent_ops[r.tobytes()] for r in subgroup.rotations]
+            sub_products = products[:, in_subgroup].min(axis=1)
+            labels = [sub_products[t].min() for t in pattern_bits]
+            equiv[:, s] = orbit_ids * parent.order \
+                + np.array(labels)[pattern_ids.ravel()]
+        return equiv
+
+    def screen_laue_classes(self) -> pd.DataFrame:
+        """
+        Evaluate merging statistics of the data in all Laue classes from
+        `hikari.symmetry.PG`, including all their settings, in one pass.
+        For each class return R_int = sum|I - <I>| / sum(I), evaluated over
+        reflections with symmetry-equivalents present, the correlation
+        coefficient CC between I and mean I of its other equivalents,
+        and the completeness of data within the sphere it occupies.
+        The correct Laue class is usually the highest one with low R_int.
+
+        Equivalence in all classes is evaluated using images of reflections
+        under two parent groups, m-3m and 6/mmm, computed only once.
+        Systematic absences are not taken into account in completeness.
+
+        :return: DataFrame with HM symbol, R_int, CC and completeness of data
+            in every Laue class, indexed by the n_c of class in PG.
+        :rtype: pd.DataFrame
+        """
+        table = PG.table[PG.table['laue_class'] == PG.table['number']]
+        laue_classes = list(table['group'])
+        parents = [PG['m-3m'], PG['6/mmm']]
+        families = [[lc for lc in laue_classes if lc <= p] for p in parents]
+        families[1] = [lc for lc in families[1] if lc not in families[0]]
+
+        hkl = self.table.loc[:, ['h', 'k', 'l']].to_numpy()
+        hkl_full = copy.copy(self)
+        hkl_full.fill(radius=max(lin.norm(hkl @ self.A_r, axis=1)))
+        hkl_full = hkl_full.table.loc[:, ['h', 'k', 'l']].to_numpy()
+        i = self.table['I'].to_numpy()
+
+        statistics = {}
+        for parent, family in zip(parents, families):
+            equiv = self._subgroup_equivalents(hkl, parent, family)
+            equiv_full = self._subgroup_equivalents(hkl_full, parent, family)
+            for lc, codes, codes_full in zip(family, equiv.T, equiv_full.T):
+                counts = np.bincount(codes)
+                inverse = (np.cumsum(counts > 0) - 1)[codes]
+                counts = counts[counts > 0]
+                sums = np.bincount(inverse, weights=i)
+                redundant = counts[inverse] > 1
+                i_mean = (sums / counts)[inverse]
+                i_others = (sums[inverse] - i)[redundant] \
+                    / (counts[inverse][redundant] - 1)
+                r_int = np.abs(i - i_mean)[redundant].sum() / i[redundant].sum()
+                cc = np.corrcoef(i[redundant], i_others)[0, 1] \
+                    if np.count_nonzero(redundant) > 1 else np.nan
+                cplt = len(counts) / np.count_nonzero(np.bincount(codes_full))
+                statistics[lc] = (r_int, cc, cplt)
+        out = pd.DataFrame([statistics[lc] for lc in laue_classes],
+                           columns=['R_int', 'CC', 'Cplt'],
+                           index=pd.Index(table['n_c'], name='n_c'))
+        out.insert(0, 'HM', table['HM'].to_numpy())
+        return out
 
     def from_dict(self, dictionary: dict):
         """
@@ -635,7 +861,74 @@ class HklFrame(BaseFrame):
         :type hkl_format: union[int, str, dict]
         """
         reader = HklReader(hkl_file_path=hkl_path, hkl_file_format=hkl_format)
-        dict_of_data = reader.read()
+        self._from_incomplete_dict(reader.read())
+
+    CIF_REFLN_KEYS = {
+        '_refln_index_h': 'h',
+        '_refln_index_k': 'k',
+        '_refln_index_l': 'l',
+        '_refln_F_meas': 'F',
+        '_refln_F_sigma': 'sf',
+        '_refln_F_squared_meas': 'I',
+        '_refln_F_squared_sigma': 'si',
+        '_refln_F_squared_calc': 'Ic',
+        '_refln_phase_calc': 'ph',
+        '_refln_scale_group_code': 'b',
+    }
+    """Names of cif `_refln` loop items imported by :meth:`read_cif`
+    mapped to the :class:`HklKey` they are stored under."""
+
+    def read_cif(self, cif_path, block=None, hkl_format='shelx_4'):
+        """
+        Read reflections stored in the `block` of .cif or .fcf file
+        specified by path, and store them in the pandas dataframe
+        in `self.data`. If present, unit cell parameters are read as well.
+        Reflections are taken from the `_refln` loop if block has one.
+        Otherwise, they are parsed from an .hkl file of `hkl_format` embedded
+        in `_shelx_hkl_file` or from an .fcf file in `_shelx_fcf_file`.
+        No intermediate .hkl file is written during the process.
+
+        :param cif_path: Absolute or relative path to the .cif or .fcf file.
+        :type cif_path: str
+        :param block: Name of the data block to read; by default the first.
+        :type block: str
+        :param hkl_format: Format of .hkl file embedded in `_shelx_hkl_file`.
+        :type hkl_format: union[int, str, dict]
+        """
+        reader = CifReader(cif_file_path=cif_path)
+        index = reader.block_index()
+        if not index:
+            raise KeyError(f'No data blocks found in {cif_path}')
+        block = next(iter(index)) if block is None else block
+        cif_block = reader.read_block(block)
+        if '_refln_index_h' not in cif_block:
+            if '_shelx_hkl_file' in cif_block:
+                lines = cif_block['_shelx_hkl_file'].splitlines()
+                hkl_reader = HklReader(hkl_file_format=hkl_format)
+                self._fill_cell_from_cif_block(cif_block)
+                self._from_incomplete_dict(hkl_reader.parse(lines))
+                return
+            elif '_shelx_fcf_file' in cif_block:
+                lines = cif_block['_shelx_fcf_file'].splitlines()
+                fcf_blocks = reader.parse(lines)
+                cif_block = next(iter(fcf_blocks.values()), CifBlock())
+            if '_refln_index_h' not in cif_block:
+                raise KeyError(f'No reflections found in block "{block}"')
+        self._fill_cell_from_cif_block(cif_block)
+        dict_of_data = {}
+        for cif_key, hkl_key in self.CIF_REFLN_KEYS.items():
+            if cif_key in cif_block:
+                dtype = HklKey.REGISTRY[hkl_key].dtype
+                dict_of_data[hkl_key] = cif_block.get_as_array(cif_key, dtype)
+        self._from_incomplete_dict(dict_of_data)
+
+    def _fill_cell_from_cif_block(self, block):
+        """Edit unit cell if parameters are present in cif `block`."""
+        if '_cell_length_a' in block:
+            self.fill_from_cif_block(block, fragile=False)
+
+    def _from_incomplete_dict(self, dict_of_data):
+        """Fill imperative keys absent in `dict_of_data`, run `from_dict`."""
         forgotten_keys = [k for k in HklKey.IMPERATIVES
                           if k not in dict_of_data.keys()]
         for key in forgotten_keys:
@@ -810,7 +1103,8 @@ class HklIo:
 
     def __init__(self, hkl_file_path, hkl_file_format):
         self.use_separator = True
-        self.file_path = make_abspath(hkl_file_path)
+        self.file_path = None if hkl_file_path is None \
+            else make_abspath(hkl_file_path)
         self.formats_defined = hkl_formats
         self.formats_aliases = hkl_aliases
         self.__format = 'shelx_4'
@@ -1001,48 +1295,99 @@ class HklIo:
 class HklReader(HklIo):
     """
     A helper class for HklFrame,
-    Manages reading hkl files and importing data and keys from them
+    Manages reading hkl files and importing data and keys from them.
+    If only `hkl_file_format` is given, the reader can :meth:`parse` lines
+    from memory, but not :meth:`read` any file.
     """
 
-    def __init__(self, hkl_file_path, hkl_file_format):
+    def __init__(self, hkl_file_path=None, hkl_file_format='shelx_4'):
         super().__init__(hkl_file_path, hkl_file_format)
 
-    def _parse_fixed_line(self, line):
-        """
-        Parse data from a line, where data from each *label* has fixed *width*.
-
-        :param line: string to be parsed based on format dictionary.
-        :type line: str
-        :return: list of strings extracted from parsed line
-        :rtype: list
-        """
-        slice_end = list(np.cumsum(self._format_dict['widths']))
-        slice_beg = [0] + slice_end[:-1]
-        try:
-            parsed = [line[beg:end] for beg, end in zip(slice_beg, slice_end)]
-            parsed = np.array(parsed)
-            assert min([len(p) for p in parsed]) > 0
-            assert len(parsed) == len(self._format_dict['widths'])
-        except (ValueError, AssertionError):
-            return None
-        return parsed
-
-    def _parse_free_line(self, line):
-        """
-        Parse data from line, where data from *labels* is separated with space.
-
-        :param line: string to be parsed based on format dictionary.
-        :type line: str
-        :return: list of strings extracted from parsed line
-        :rtype: list
+    def _split_fixed_lines(self, lines):
+        """
+        Split all `lines`, where data from each *label* has fixed *width*,
+        at once into a 2D array of strings with one column per *label*.
+        Lines too short to hold a value of every *label* are skipped.
+
+        :param lines: strings to be split based on format dictionary.
+        :type lines: list
+        :return: array of strings extracted from split lines and a list
+            of lines which were not skipped
+        :rtype: tuple[numpy.ndarray, list]
+        """
+        widths = np.abs(self._format_dict['widths'])
+        slice_end = np.cumsum(widths)
+        slice_beg = slice_end - widths
+        lines = [line for line in lines if len(line) > slice_beg[-1]]
+        chars = np.array(lines, dtype=f'U{slice_end[-1]}').reshape(-1)
+        chars = chars.view('U1').reshape(len(lines), slice_end[-1])
+        columns = [np.ascontiguousarray(chars[:, beg:end]).view(f'U{end-beg}')
+                   for beg, end in zip(slice_beg, slice_end)]
+        words = np.hstack(columns) if columns else np.empty((0, 0), dtype=str)
+        return words, lines
+
+    def _split_free_lines(self, lines):
+        """
+        Split all `lines`, where data from *labels* is separated with space,
+        into a 2D array of strings with one column per *label*.
+        Lines with a number of words other than number of *labels* are skipped.
+
+        :param lines: strings to be split based on format dictionary.
+        :type lines: list
+        :return: array of strings extracted from split lines and a list
+            of lines which were not skipped
+        :rtype: tuple[numpy.ndarray, list]
+        """
+        n_labels = len(self._format_dict['labels'])
+        split_lines = [(line, line.split()) for line in lines]
+        split_lines = [(l, w) for l, w in split_lines if len(w) == n_labels]
+        lines = [line for line, _ in split_lines]
+        words = [w for _, w in split_lines]
+        words = np.array(words, dtype=str).reshape(len(words), n_labels)
+        return words, lines
+
+    def parse(self, lines):
+        """
+        Parse all `lines` of current :attr:`hkl_file_format` in bulk,
+        converting the data column-wise and return them to a dictionary.
+        Lines which are structurally not data, i.e. blank lines, comments
+        starting with "#", lines too short for the format and header lines
+        with no numeric field, are skipped. Lines where only some of the
+        numeric fields can be interpreted are considered corrupted.
+
+        :param lines: Iterable with lines of .hkl file, without line breaks
+        :type lines: Iterable[str]
+        :raises ValueError: if any data line contains non-numeric value
+            in a numeric column
+        :return: A dictionary containing information parsed from lines.
+        :rtype: dict
         """
-        parsed = np.array(line.strip().split())
-        try:
-            parsed.astype('float64')
-            assert len(parsed) == len(self._format_dict['widths'])
-        except (ValueError, AssertionError):
-            return None
-        return parsed
+        lines = [line for line in lines
+                 if line.strip() and not line.lstrip().startswith('#')]
+        if self.is_current_format_free:
+            words, lines = self._split_free_lines(lines)
+        else:
+            words, lines = self._split_fixed_lines(lines)
+        labels = self._format_dict['labels']
+        numeric = [np.issubdtype(HklKey.REGISTRY[k].dtype, np.number)
+                   for k in labels]
+        values = [pd.to_numeric(words[:, i], errors='coerce') if n else None
+                  for i, n in enumerate(numeric)]
+        parsed = [~np.isnan(v) for v in values if v is not None]
+        n_parsed = np.sum(parsed, axis=0) if parsed else np.zeros(len(words))
+        valid = n_parsed > 0
+        corrupted = np.flatnonzero(valid & (n_parsed < len(parsed)))
+        if len(corrupted):
+            raise ValueError(f'{len(corrupted)} data line(s) contain values '
+                             f'which do not match format {labels}, e.g.: '
+                             f'"{lines[corrupted[0]]}"')
+        dict_of_data = dict()
+        for index, key in enumerate(labels):
+            key_dtype = HklKey.REGISTRY[key].dtype
+            column = words[valid, index] if values[index] is None \
+                else values[index][valid]
+            dict_of_data[key] = column.astype(key_dtype)
+        return dict_of_data
 
     def read(self):
         """
@@ -1052,31 +1397,8 @@ class HklReader(HklIo):
         :return: A dictionary containing information read from .hkl file.
         :rtype: dict
         """
-        if self.is_current_format_free:
-            def parse_line(line):
-                return self._parse_free_line(line)
-        else:
-            def parse_line(line):
-                return self._parse_fixed_line(line)
-
-        def read_file_to_list_of_data():
-            list_of_reflections = list()
-            with open(self.file_path, 'r') as hkl_file:
-                for line in hkl_file.read().splitlines():
-                    parsed_line = parse_line(line)
-                    if parsed_line is None:
-                        continue
-                    list_of_reflections.append(parsed_line)
-            return np.array(list_of_reflections).transpose()
-        array_of_reflections = read_file_to_list_of_data()
-
-        def build_dict_of_reflections(_hkl_array):
-            dict_of_data = dict()
-            for index, key in enumerate(self._format_dict['labels']):
-                key_dtype = HklKey.REGISTRY[key].dtype
-                dict_of_data[key] = _hkl_array[index].astype(key_dtype)
-            return dict_of_data
-        return build_dict_of_reflections(array_of_reflections)
+        with open(self.file_path, 'r') as hkl_file:
+            return self.parse(hkl_file.read().splitlines())
 
 
 class HklWriter(HklIo):
@@ -1,11 +1,82 @@
+import re
 from enum import Enum
 from collections import defaultdict
 import numpy as np
+import hikari
 from hikari.dataframes import BaseFrame
 from hikari.resources import Xray_atomic_form_factors
 from hikari.utility import split_atom_label, make_abspath
 
 res_instructions = defaultdict(set)
+form_factor_species = {e: i for i, e in
+                       enumerate(Xray_atomic_form_factors.index)}
+form_factor_coefficients = Xray_atomic_form_factors.loc[
+    :, ['a1', 'b1', 'a2', 'b2', 'a3', 'b3', 'a4', 'b4', 'c']].to_numpy(float)
+
+
+_f0_cache = {}
+"""Sorted sin(theta)/lambda shells and form factors evaluated for species"""
+
+
+def _f0_evaluate(species_ids, sintl):
+    """Evaluate form factors of `species_ids` at `sintl` without caching"""
+    coefficients = form_factor_coefficients[species_ids]
+    sintl2 = sintl ** 2
+    a = coefficients[:, 0:8:2, np.newaxis]
+    b = coefficients[:, 1:8:2, np.newaxis]
+    return (a * np.exp(-b * sintl2)).sum(axis=1) + coefficients[:, 8:9]
+
+
+def _f0_shells(species_id, shells):
+    """Form factors of `species_id` at sorted, unique `shells`, cached"""
+    known, values = _f0_cache.get(species_id, (np.zeros(0), np.zeros(0)))
+    positions = np.searchsorted(known, shells).clip(max=max(len(known) - 1, 0))
+    hit = known[positions] == shells if len(known) \
+        else np.zeros(len(shells), dtype=bool)
+    f = np.empty(len(shells))
+    f[hit] = values[positions[hit]]
+    if hit.all():
+        return f
+    missing = ~hit
+    f[missing] = _f0_evaluate([species_id], shells[missing])[0]
+    known = np.concatenate([known, shells[missing]])
+    values = np.concatenate([values, f[missing]])
+    cached_size = sum(len(k) for k, _ in _f0_cache.values())
+    cache_limit = hikari.MEMORY_SIZE // 10 // (2 * known.itemsize)
+    if cached_size + np.count_nonzero(missing) > cache_limit:
+        _f0_cache.clear()
+        known, values = shells, f
+    if len(known) <= cache_limit:
+        order = np.argsort(known)
+        _f0_cache[species_id] = (known[order], values[order])
+    return f
+
+
+def f0(species_ids, sintl):
+    """
+    Calculate X-ray atomic form factors of many species for many reflections
+    at once using coefficients stored in :data:`form_factor_coefficients`.
+    Form factors are evaluated once per unique sin(theta)/lambda value, and
+    values of every species in each resolution shell are cached, so that
+    shells seen in previous calls are not re-evaluated. The cache is cleared
+    when it would exceed a tenth of :data:`hikari.MEMORY_SIZE`.
+
+    :param species_ids: A 1D array of species indices, as listed in
+        :data:`form_factor_species`, to evaluate form factors for
+    :type species_ids: np.array
+    :param sintl: A 1D array of sin(theta)/lambda values of reflections
+    :type sintl: np.array
+    :return: A 2D array of form factors for every species (rows)
+        and sin(theta)/lambda value (columns)
+    :rtype: np.array
+    """
+    species_ids = np.asarray(species_ids, dtype=np.intp).ravel()
+    sintl = np.asarray(sintl, dtype=np.float64).ravel()
+    shells, inverse = np.unique(sintl, return_inverse=True)
+    f = np.empty((len(species_ids), len(shells)))
+    for row, species_id in enumerate(species_ids):
+        f[row] = _f0_shells(int(species_id), shells)
+    return f[:, inverse]
 
 
 class ResInstructionType(Enum):
@@ -16,9 +87,57 @@ class ResInstructionType(Enum):
 
 
 class ResFrame(BaseFrame):
+    ATOM_U_COLUMNS = ('u11', 'u22', 'u33', 'u23', 'u13', 'u12')
+    """Names of anisotropic displacement columns in :attr:`atoms` table"""
+
+    KEY_TYPES = {
+        'TITL': 'multiline',
+        'CELL': 'listing',
+        'ZERR': 'listing',
+        'LATT': 'listing',
+        'SYMM': 'multiline',
+        'SFAC': 'listing',
+        'UNIT': 'listing',
+        'L.S.': 'listing',
+        'PLAN': 'listing',
+        'SIZE': 'listing',
+        'MORE': 'listing',
+        'BOND': 'listing',
+        'CONF': 'listing',
+        'FMAP': 'listing',
+        'ACTA': 'listing',
+        'WGHT': 'listing',
+        'FVAR': 'listing',
+        'HKLF': 'listing',
+    }
+    """Types of ins/res instructions interpreted by :meth:`parse`"""
+
+    INSTRUCTIONS = frozenset({
+        'ABIN', 'ACTA', 'AFIX', 'ANIS', 'ANSC', 'ANSR', 'BASF', 'BIND', 'BLOC',
+        'BOND', 'BUMP', 'CELL', 'CGLS', 'CHIV', 'CONF', 'CONN', 'DAMP', 'DANG',
+        'DEFS', 'DELU', 'DFIX', 'DISP', 'EADP', 'END', 'EQIV', 'EXTI', 'EXYZ',
+        'FEND', 'FLAT', 'FMAP', 'FRAG', 'FREE', 'FVAR', 'GRID', 'HFIX', 'HKLF',
+        'HOPE', 'HTAB', 'ISOR', 'L.S.', 'LATT', 'LAUE', 'LIST', 'MERG', 'MORE',
+        'MOVE', 'MPLA', 'NCSY', 'NEUT', 'OMIT', 'PART', 'PLAN', 'PRIG', 'REM',
+        'RESI', 'RIGU', 'RTAB', 'SADI', 'SAME', 'SFAC', 'SHEL', 'SIMU', 'SIZE',
+        'SPEC', 'STIR', 'SUMP', 'SWAT', 'SYMM', 'TEMP', 'TIME', 'TITL', 'TWIN',
+        'TWST', 'UNIT', 'WGHT', 'WIGL', 'WPDB', 'XNPD', 'ZERR',
+    })
+    """Names of SHELXL instructions, which can not be used as atom names"""
+
     def __init__(self):
         super().__init__()
         self.data = {}
+        """Dictionary with ins/res instructions stored as lists of strings"""
+
+        self.atoms = self._atom_table([])
+        """
+        Columnar table of atoms: a dictionary with arrays of equal length,
+        "label", "sfac", "x", "y", "z", "occupancy" (decoded from site
+        occupation factor), "u_iso" (nan for anisotropic atoms, negative
+        for riding atoms), and "u11", "u22", "u33", "u23", "u13", "u12"
+        (nan for isotropic atoms).
+        """
 
     def atomic_form_factor(self, atom, hkl):
         """
@@ -31,13 +150,13 @@ class ResFrame(BaseFrame):
         :return: A 1D array listing atomic form factors for desired hkls
         :rtype: np.array
         """
-        r_star = self.A_r @ hkl.T
-        s = Xray_atomic_form_factors.loc[atom]
-        sintl2 = (r_star * r_star).sum(axis=0) / 4
-        return s['a1'] * np.exp(-s['b1'] * sintl2) + \
-               s['a2'] * np.exp(-s['b2'] * sintl2) + \
-               s['a3'] * np.exp(-s['b3'] * sintl2) + \
-               s['a4'] * np.exp(-s['b4'] * sintl2) + s['c']
+        sintl = np.sqrt(self._sintl2(hkl))
+        return f0([form_factor_species[atom]], sintl)[0]
+
+    def _sintl2(self, hkl):
+        """Squared sin(theta)/lambda for every hkl in a 2D array"""
+        r_star = np.asarray(hkl) @ self.A_r
+        return (r_star * r_star).sum(axis=-1) / 4
 
     def temperature_factor(self, hkl, u):
         """
@@ -54,9 +173,54 @@ class ResFrame(BaseFrame):
         hkl_n_u_n_hkl = (hkl @ n_matrix * hkl @ n_matrix @ u.T).sum(axis=-1)
         return np.exp(-2 * np.pi ** 2 * hkl_n_u_n_hkl)
 
+    def _atom_arrays(self):
+        """
+        Convert atoms stored in :attr:`atoms` table into a dict of arrays:
+        'element' with (n, ) element names, 'xyz' with (n, 3) fractional
+        coordinates, 'occupancy' with (n, ) occupancies, 'u_iso' with (n, )
+        isotropic displacement parameters (nan for anisotropic atoms), and
+        'u' with (n, 3, 3) anisotropic displacement matrices (zero for
+        isotropic atoms). Negative, riding `u_iso` are multiplied by
+        the equivalent isotropic u of the last preceding non-riding atom.
+
+        :return: A dictionary with arrays describing all atoms
+        :rtype: dict
+        """
+        atoms = self.atoms
+        n_atoms = len(atoms['label'])
+        sfac = self.data.get('SFAC', [])
+        element = np.array([sfac[s - 1] if 0 < s <= len(sfac) and
+                            not sfac[s - 1][0].isdigit()
+                            else split_atom_label(label)[0]
+                            for label, s in zip(atoms['label'], atoms['sfac'])],
+                           dtype=object)
+        element = np.array([e.title() for e in element], dtype=object)
+        xyz = np.stack([atoms['x'], atoms['y'], atoms['z']], axis=-1)
+        u6 = np.nan_to_num(np.stack([atoms[k] for k in self.ATOM_U_COLUMNS]))
+        u11, u22, u33, u23, u13, u12 = u6
+        u = np.stack([u11, u12, u13, u12, u22, u23, u13, u23, u33],
+                     axis=-1).reshape(n_atoms, 3, 3)
+        n_matrix = np.diag([self.a_r, self.b_r, self.c_r])
+        metric = n_matrix @ self.G_d @ n_matrix
+        u_iso = atoms['u_iso'].copy()
+        riding = u_iso < 0
+        u_eq = np.where(np.isnan(u_iso),
+                        np.einsum('nij,ji->n', u, metric) / 3, u_iso)
+        last_rider = np.maximum.accumulate(
+            np.where(riding, -1, np.arange(n_atoms))) if n_atoms else []
+        u_iso[riding] *= -u_eq[np.clip(last_rider, 0, None)][riding]
+        return {'element': element, 'xyz': xyz,
+                'occupancy': atoms['occupancy'].copy(),
+                'u_iso': u_iso, 'u': u}
+
     def form_factor(self, hkl, space_group):
         """
-        Calculate form factors based on current structure, hkls, and space group
+        Calculate form factors based on current structure, hkls, and space group.
+        Atomic form factors are evaluated once per element, and contributions
+        of all atoms and their symmetry equivalents are summed as arrays
+        in chunks of hkl small enough to fit in :data:`hikari.MEMORY_SIZE`.
+        Each equivalent uses the rotated hkl instead of rotated coordinates
+        and displacement matrices, so the atoms are never expanded.
 
         :param hkl: A 2D array listing all hkls to consider
         :type hkl: np.array
@@ -65,121 +229,286 @@ class ResFrame(BaseFrame):
         :return: A 1D array listing total form factors for desired hkls
         :rtype: np.array
         """
-        f = np.zeros_like(hkl.sum(axis=-1), dtype='complex128')
-        for k, v in self.data['ATOM'].items():
-            atom = split_atom_label(k)[0].title()
-            xyz = np.fromiter(map(float, v[1:4]), dtype=np.float)
-            occupation = float(v[4]) % 10
-            uij_strings = v[5:] if len(v[5:]) == 6 else [v[5]] * 3 + ['0'] * 3
-            u11, u22, u33, u23, u13, u12 = map(float, uij_strings)
-            u = np.array([[u11, u12, u13], [u12, u22, u23], [u13, u23, u33]])
-            for o in space_group.operations:
-                xyz_t = (o.tf @ np.array(xyz)).T + o.tl
-                u_t = o.tf @ u @ (o**-1).tf
-                fa = occupation * self.atomic_form_factor(atom, hkl) * \
-                    self.temperature_factor(hkl, u_t)
-                f += fa * np.exp(2j * np.pi * xyz_t @ hkl.T)
+        hkl = np.asarray(hkl).reshape(-1, 3)
+        atoms = self._atom_arrays()
+        elements, species = np.unique(atoms['element'].astype(str),
+                                      return_inverse=True)
+        species_ids = [form_factor_species[e] for e in elements]
+        n_matrix = np.diag([self.a_r, self.b_r, self.c_r])
+        beta = 2 * np.pi ** 2 * n_matrix @ atoms['u'] @ n_matrix
+        beta6 = np.stack([beta[:, 0, 0], beta[:, 1, 1], beta[:, 2, 2],
+                          2 * beta[:, 0, 1], 2 * beta[:, 0, 2],
+                          2 * beta[:, 1, 2]])
+        u_iso = np.nan_to_num(atoms['u_iso'])
+        f = np.zeros(len(hkl), dtype=np.complex128)
+        chunk_size = max(1, hikari.MEMORY_SIZE // (64 * max(len(species), 1)))
+        for beg in range(0, len(hkl), chunk_size):
+            h = hkl[beg:beg + chunk_size].astype(float)
+            sintl2 = self._sintl2(h)
+            f_atomic = f0(species_ids, np.sqrt(sintl2))
+            scattering = f_atomic[species].T * atoms['occupancy'] * \
+                np.exp(-8 * np.pi ** 2 * np.outer(sintl2, u_iso))
+            for rotation, translation in zip(space_group.rotations,
+                                             space_group.translations):
+                h_rot = h @ rotation
+                hh = np.hstack([h_rot ** 2,
+                                h_rot[:, [0, 0, 1]] * h_rot[:, [1, 2, 2]]])
+                exponent = 2j * np.pi * (h_rot @ atoms['xyz'].T) - hh @ beta6
+                f_equivalents = (scattering * np.exp(exponent)).sum(axis=1)
+                f[beg:beg + chunk_size] += f_equivalents * \
+                    np.exp(2j * np.pi * h @ translation)
+        return f
+
+    @staticmethod
+    def _fft_size(n):
+        """Smallest integer not lower than `n` with no prime factors over 5"""
+        n = max(int(n), 1)
+        while True:
+            m = n
+            for p in (2, 3, 5):
+                while m % p == 0:
+                    m //= p
+            if m == 1:
+                return n
+            n += 1
+
+    def form_factor_fft(self, hkl, space_group, oversampling=1.5,
+                        accuracy=1e-5):
+        """
+        Calculate form factors based on current structure, hkls, and space
+        group using the fast Fourier transform of a sampled electron density.
+        For every element, its atoms and their symmetry equivalents are placed
+        on a grid as Gaussians smeared by their displacement parameters.
+        Each grid is Fourier-transformed and multiplied by the element's
+        Gaussian atomic form factor. To suppress aliasing, the smallest
+        Gaussians are blurred isotropically, which is reverted after the FFT.
+        The cost scales with the number of grid points rather than
+        with the number of reflections times atoms and operations.
+
+        :param hkl: A 2D array listing all hkls to consider
+        :type hkl: np.array
+        :param space_group: Space group describing the internal crystal symmetry
+        :type space_group: hikari.symmetry.Group
+        :param oversampling: Ratio of the grid density to the minimum required
+            to represent the highest resolution in hkl; must be greater than 1.
+            Higher oversampling improves accuracy at the cost of a larger grid.
+        :type oversampling: float
+        :param accuracy: Relative magnitude below which Gaussians are cut off
+            and aliased contributions are neglected.
+        :type accuracy: float
+        :return: A 1D array listing total form factors for desired hkls
+        :rtype: np.array
+        """
+        if oversampling <= 1:
+            raise ValueError('oversampling must be greater than 1')
+        hkl = np.asarray(hkl).reshape(-1, 3).astype(int)
+        f = np.zeros(len(hkl), dtype=np.complex128)
+        atoms = self._atom_arrays()
+        if len(hkl) == 0 or len(atoms['xyz']) == 0:
+            return f
+        h_max = np.abs(hkl).max(axis=0)
+        q_max = np.sqrt(4 * self._sintl2(hkl).max())
+        lengths = np.array([self.a_d, self.b_d, self.c_d])
+        shape = np.array([self._fft_size(max(np.ceil(2 * oversampling * l_ * q_max),
+                                             2 * h + 1))
+                          for l_, h in zip(lengths, h_max)])
+        q_alias = ((shape - h_max) / lengths).min()
+        log_accuracy = -np.log(accuracy)
+
+        # DISPLACEMENT MATRICES OF ALL ATOMS IN CARTESIAN SYSTEM
+        n_matrix = np.diag([self.a_r, self.b_r, self.c_r])
+        u_frac = n_matrix @ atoms['u'] @ n_matrix
+        u_frac += np.nan_to_num(atoms['u_iso'])[:, np.newaxis, np.newaxis] * \
+            self.G_r[np.newaxis]
+        a_d = self.A_d
+        u_cart = a_d.T @ u_frac @ a_d
+        u_min = np.linalg.eigvalsh(u_cart).min()
+        u_extra = max(log_accuracy / (2 * np.pi ** 2 * q_alias ** 2) - u_min, 0)
+
+        # PLACE ATOMS OF EVERY ELEMENT ON A SEPARATE GRID AND TRANSFORM IT
+        elements, species = np.unique(atoms['element'].astype(str),
+                                      return_inverse=True)
+        rotations = space_group.rotations.astype(float)
+        translations = space_group.translations
+        spacing = np.linalg.norm(lengths / shape)
+        f_atomic = f0([form_factor_species[e] for e in elements],
+                      np.sqrt(self._sintl2(hkl)))
+        flip = (hkl[:, 2] % shape[2]) > shape[2] // 2
+        hkl_half = np.where(flip[:, np.newaxis], -hkl, hkl) % shape
+        for element_index, element in enumerate(elements):
+            grid = np.zeros(np.prod(shape))
+            indices, weights, n_buffered = [], [], 0
+            for atom in np.flatnonzero(species == element_index):
+                sigmas = a_d.T @ rotations @ u_frac[atom] @ \
+                    rotations.transpose(0, 2, 1) @ a_d + u_extra * np.eye(3)
+                radius = np.sqrt(2 * log_accuracy *
+                                 np.linalg.eigvalsh(sigmas).max())
+                half_widths = np.ceil(radius * np.array(
+                    [self.a_r, self.b_r, self.c_r]) * shape).astype(int)
+                offsets = np.stack(np.meshgrid(
+                    *[np.arange(-w, w + 1) for w in half_widths],
+                    indexing='ij'), axis=-1).reshape(-1, 3)
+                in_sphere = np.linalg.norm((offsets / shape) @ a_d, axis=1) \
+                    <= radius + spacing
+                offsets = offsets[in_sphere]
+                chunk_size = max(1, hikari.MEMORY_SIZE // (160 * len(offsets)))
+                for beg in range(0, len(rotations), chunk_size):
+                    end = beg + chunk_size
+                    positions = rotations[beg:end] @ atoms['xyz'][atom] + \
+                        translations[beg:end]
+                    sigma_inv = np.linalg.inv(sigmas[beg:end])
+                    s6 = np.stack([sigma_inv[:, 0, 0], sigma_inv[:, 1, 1],
+                                   sigma_inv[:, 2, 2], sigma_inv[:, 0, 1],
+                                   sigma_inv[:, 0, 2], sigma_inv[:, 1, 2]])
+                    norm = atoms['occupancy'][atom] / np.sqrt(
+                        (2 * np.pi) ** 3 * np.linalg.det(sigmas[beg:end]))
+                    points = np.rint(positions * shape).astype(int)[
+                        :, np.newaxis, :] + offsets[np.newaxis]
+                    d = (points / shape - positions[:, np.newaxis, :]) @ a_d
+                    d6 = np.concatenate([d ** 2, 2 * d[..., [0, 0, 1]] *
+                                         d[..., [1, 2, 2]]], axis=-1)
+                    exponent = (d6 @ s6.T[:, :, np.newaxis])[..., 0]
+                    density = norm[:, np.newaxis] * np.exp(-exponent / 2)
+                    indices.append(np.ravel_multi_index(
+                        (points % shape).reshape(-1, 3).T, shape))
+                    weights.append(density.reshape(-1))
+                    n_buffered += density.size
+                    if n_buffered * 16 > hikari.MEMORY_SIZE:
+                        grid += np.bincount(np.concatenate(indices),
+                                            weights=np.concatenate(weights),
+                                            minlength=grid.size)
+                        indices, weights, n_buffered = [], [], 0
+            if indices:
+                grid += np.bincount(np.concatenate(indices),
+                                    weights=np.concatenate(weights),
+                                    minlength=grid.size)
+            transform = np.fft.rfftn(grid.reshape(shape))[tuple(hkl_half.T)]
+            transform = np.where(flip, transform, np.conj(transform))
+            f += f_atomic[element_index] * transform
+        f *= self.v_d / np.prod(shape) * \
+            np.exp(8 * np.pi ** 2 * u_extra * self._sintl2(hkl))
         return f
-    # TODO the factors seem to be evaluated incorrectly, check in the future
 
     def read(self, path):
         """
-        Read data from specified ins/res file and return an dict
+        Read data from specified ins/res file into :attr:`data`
+        and :attr:`atoms`, see :meth:`parse`.
 
         :param path: Relative or absolute path to the res file to be read
         :type path: str
         :return: None
         :rtype: None
         """
-
-        # SPECIFY DEFAULT VALUES OF NECESSARY KEYS
-        self.data['REM'] = ['These comments were found by resins:']
-        self.data['ATOM'] = dict()
-        self.data['PEAK'] = dict()
-        self.data['TITL'] = list()
-        self.data['SYMM'] = list()
-
-        # SPECIFY SUPPORTED KEYS AND THEIR TYPES
-        key_types = {
-            'TITL': 'multiline',
-            'CELL': 'listing',
-            'ZERR': 'listing',
-            'LATT': 'listing',
-            'SYMM': 'multiline',
-            'SFAC': 'listing',
-            'UNIT': 'listing',
-            'L.S.': 'listing',
-            'PLAN': 'listing',
-            'SIZE': 'listing',
-            'MORE': 'listing',
-            'BOND': 'listing',
-            'CONF': 'listing',
-            'FMAP': 'listing',
-            'ACTA': 'listing',
-            'WGHT': 'listing',
-            'FVAR': 'listing',
-            'HKLF': 'listing',
-            'REM': 'special',
-            'END': 'special',
-        }
-
-        # READ THE FILE AND JOIN LINES SEPARATED BY '=' SIGN
         with open(make_abspath(path), 'r') as res_file:
-            lines = res_file.read().replace('=\n', '').split('\n')
-            lines = [line.strip() for line in lines if line.strip()]
+            self.parse(res_file.read())
+
+    def parse(self, text):
+        """
+        Parse contents of ins/res file in a single pass. Instructions are
+        stored in :attr:`data` as lists of strings, while atoms are collected
+        into a columnar table of arrays in :attr:`atoms`. Lines continued
+        with a "=" sign are joined, and unit cell is set based on "CELL".
+
+        :param text: Contents of the ins/res file
+        :type text: str
+        :return: None
+        :rtype: None
+        """
+        self.data = {'TITL': [], 'SYMM': [],
+                     'REM': ['These comments were found by resins:']}
+        peaks = {}
+        atom_rows = []
 
         class ResIoStage(Enum):
-            TITLE = 0
             PREAMBLE = 1
             ATOMS = 2
             APPENDIX = 3
             END = 4
 
-        # READ THE FILE AND GATHER ALL COMMENTS, ATOMS AND PEAKS
         reading_stage = ResIoStage.PREAMBLE
-        lines_to_delete = []
-        for index, line in enumerate(lines):
-            key = line.split(maxsplit=1)[0]
-            values = list(line[len(key):].strip().split())
-            if key.upper() == 'FVAR':
+        for line in re.sub(r'=[ \t]*\r?\n', ' ', text).splitlines():
+            tokens = line.split()
+            if not tokens:
+                continue
+            key = tokens[0]
+            key_upper = key.upper()
+            key_type = self.KEY_TYPES.get(key_upper)
+            if reading_stage is ResIoStage.ATOMS and \
+                    key_upper[:4] not in self.INSTRUCTIONS and \
+                    5 <= len(tokens) <= 12 and key[0].isalpha():
+                atom_rows.append(tokens)
+            elif key_upper == 'REM':
+                self.data['REM'].append(line.strip())
+            elif reading_stage is ResIoStage.END:
+                if key_upper[0] == 'Q' and key[1:2].isdigit():
+                    peaks[key] = tokens[1:]
+            elif key_type == 'listing':
+                self.data[key_upper] = tokens[1:]
+            elif key_type == 'multiline':
+                self.data[key_upper].append(line.strip()[len(key):].strip())
+            elif key_upper == 'END':
+                reading_stage = ResIoStage.END
+            else:
+                self.data['REM'].append('Line not interpreted: ' + line.strip())
+            if key_upper == 'FVAR':
                 reading_stage = ResIoStage.ATOMS
-            elif key.upper() == 'HKLF':
+            elif key_upper == 'HKLF':
                 reading_stage = ResIoStage.APPENDIX
-            elif key.upper() == 'END':
-                reading_stage = ResIoStage.END
-            elif key.upper() == 'REM':
-                self.data['REM'].append(line)
-                lines_to_delete.append(index)
-            elif all((key.upper() not in key_types.keys(),
-                      reading_stage is ResIoStage.END,
-                      key[0] == 'Q', key[1].isdigit())):
-                self.data['PEAK'][key] = values
-                lines_to_delete.append(index)
-            elif all((key.upper() not in key_types.keys(),
-                      reading_stage is ResIoStage.ATOMS,
-                      key[0].isalpha())):
-                self.data['ATOM'][key] = values
-                lines_to_delete.append(index)
-            elif key.upper() not in key_types.keys():
-                self.data['REM'].append('Line not interpreted: '+line)
-                lines_to_delete.append(index)
-        for index in reversed(lines_to_delete):
-            del lines[index]
-
-        # FOR EACH LINE SPLIT LINE TO KEY AND VALUE AND APPEND SELF
-        for line in lines:
-            key = line.split(maxsplit=1)[0].upper()
-            value = line[len(key):].strip()
-            if key_types[key] == 'listing':
-                self.data[key] = list(value.split())
-            elif key_types[key] == 'string':
-                self.data[key] = value
-            elif key_types[key] == 'multiline':
-                self.data[key].append(value)
-            elif key == 'END':
-                break
-
-        # BRING REM, ATOM AND PEAK TO THE END AND RETURN DICTIONARY
-        self.data.move_to_end('REM')
-        self.data.move_to_end('ATOM')
-        self.data.move_to_end('PEAK')
+        self.data['PEAK'] = peaks
+        self.atoms = self._atom_table(atom_rows)
+        if 'CELL' in self.data:
+            cell = list(map(float, self.data['CELL'][1:7]))
+            self.edit_cell(**dict(zip(('a', 'b', 'c', 'al', 'be', 'ga'), cell)))
+
+    def _atom_table(self, rows):
+        """
+        Convert lists of atom labels followed by their numeric fields into
+        a columnar table, see :attr:`atoms`. Numbers in rows of equal length
+        are converted at once; rows which are not numeric are not atoms and
+        are stored in :attr:`data` "REM" instead. Site occupation factors
+        are decoded using free variables from "FVAR" instruction; if absent,
+        they default to 11 (fixed full occupancy) and U to 0.05.
+
+        :param rows: A list of lists with atom label and numeric fields
+        :type rows: list[list[str]]
+        :return: A dictionary with atom table columns
+        :rtype: dict
+        """
+        numbers = np.full((len(rows), 11), np.nan)
+        valid = np.ones(len(rows), dtype=bool)
+        row_lengths = np.array([len(row) for row in rows], dtype=int)
+        for row_length in np.unique(row_lengths):
+            indices = np.flatnonzero(row_lengths == row_length)
+            try:
+                numbers[indices, :row_length - 1] = np.array(
+                    [v for i in indices for v in rows[i][1:]], dtype=float
+                ).reshape(len(indices), row_length - 1)
+            except ValueError:
+                for i in indices:
+                    try:
+                        numbers[i, :row_length - 1] = \
+                            np.array(rows[i][1:], dtype=float)
+                    except ValueError:
+                        valid[i] = False
+        for i in np.flatnonzero(~valid):
+            self.data['REM'].append('Line not interpreted: ' + ' '.join(rows[i]))
+        labels = [row[0] for row, v in zip(rows, valid) if v]
+        numbers = numbers[valid]
+        aniso = ~np.isnan(numbers[:, 10])
+        u_iso = np.where(aniso, np.nan, np.nan_to_num(numbers[:, 5], nan=0.05))
+        u_aniso = np.where(aniso[:, np.newaxis], numbers[:, 5:], np.nan)
+        free_variables = np.array([np.nan] + list(
+            map(float, self.data.get('FVAR', []))))
+        sof = np.nan_to_num(numbers[:, 4], nan=11.0)
+        m = np.rint(sof / 10).astype(int)
+        p = sof - 10 * m
+        fv = free_variables[np.clip(np.abs(m), 0, len(free_variables) - 1)]
+        fv[np.abs(m) >= len(free_variables)] = np.nan
+        occupancy = np.select([m == 0, np.abs(m) == 1, m > 1],
+                              [sof, p, p * fv], p * (fv - 1))
+        table = {'label': np.array(labels, dtype=str),
+                 'sfac': numbers[:, 0].astype(int),
+                 'x': numbers[:, 1], 'y': numbers[:, 2], 'z': numbers[:, 3],
+                 'occupancy': occupancy, 'u_iso': u_iso}
+        table.update(zip(self.ATOM_U_COLUMNS, u_aniso.T))
+        return table
@@ -34,7 +34,17 @@ hkl_formats = _load_json('hkl_formats_defined.json')
 hkl_aliases = _load_json('hkl_formats_aliases.json')
 hkl_mercury_style = _load_text('hkl.msd')
 characteristic_radiation = _load_json('characteristic_radiation.json')
-cif_core_dict = _load_text('cif_core_2.4.5.dic')
 Xray_atomic_form_factors = _load_indexed_csv('Xray_atomic_form_factors.csv')
 point_groups_dataframe = _load_indexed_wsv('point_groups.wsv')
 space_groups_dataframe = _load_indexed_wsv('space_groups.wsv')
+
+
+_lazy_text_resources = {'cif_core_dict': 'cif_core_2.4.5.dic',
+                        'cif_core_index_json': 'cif_core_2.4.5.json'}
+
+
+def __getattr__(name: str) -> str:
+    if name in _lazy_text_resources:  # loaded on first access, see PEP 562
+        value = globals()[name] = _load_text(_lazy_text_resources[name])
+        return value
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
@@ -18,3 +18,4 @@ from .hkl_completeness import completeness_statistics, dac_statistics, \
     simulate_dac, reformat_hkl
 from .compare_adps import animate_similarity_index, calculate_similarity_indices
 from .r1_map import r1_map
+from .hkl_simulation import simulate_dataset
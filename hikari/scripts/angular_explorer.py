@@ -158,7 +158,7 @@ class AngularPropertyExplorer:
         elif self.axis in {'yz'}:
             f.table = f.table.loc[f.table['h'].eq(0)]
         if self.axis in {'x', 'y', 'z', 'xy', 'xz', 'yz'}:
-            f.transform([o.tf for o in self.pg.operations])
+            f.transform(self.pg.rotations)
         f.extinct(self.sg)
         return f
 
@@ -253,8 +253,7 @@ class AngularPropertyExplorer:
                 a = lin.inv(self.orientation) @ np.array((1, 0, 0))
             else:
                 raise ValueError(f'Unknown orientation: {self.orientation}')
-            for op in self.lg.operations:
-                v = self.hkl_frame.A_r.T @ op.tf @ a
+            for v in self.lg.transform_vectors([a])[:, 0] @ self.hkl_frame.A_r:
                 c = np.rad2deg(cart2sph(*v))
                 if c[1] in self.th_limits and c[2] in self.ph_limits:
                     _focus.append(v / lin.norm(v))
@@ -1,17 +1,23 @@
-from typing import Any, Iterable
+from typing import Iterable, Union
 
 import matplotlib.pyplot as plt
 from matplotlib import animation
 from mpl_toolkits.mplot3d import axes3d
 import numpy as np
 import numpy.linalg as lin
-from uncertainties import ufloat, ufloat_fromstr, unumpy, UFloat
 
-from hikari.dataframes import BaseFrame, CifFrame, UBaseFrame
-from hikari.utility import make_abspath, cfloat, det3x3, chemical_elements, \
+from hikari.dataframes import BaseFrame, CifFrame
+from hikari.utility import make_abspath, det3x3, chemical_elements, \
     rotation_around
 
 
+ADP_COMPONENTS = ('11', '22', '33', '12', '13', '23')
+"""Order of independent ADP components in similarity index jacobians"""
+
+CELL_PARAMETERS = ('a', 'b', 'c', 'al', 'be', 'ga')
+"""Order of unit cell parameters in similarity index jacobians"""
+
+
 def calculate_similarity_indices(cif1_path: str,
                                  cif2_path: str = None,
                                  cif1_block: str = None,
@@ -56,8 +62,9 @@ def calculate_similarity_indices(cif1_path: str,
     The behaviour of script can be further altered via other parameters.
     If `output_file` is set True, the results will be written there instead of
     console. If `uncertainties` is set True, standard deviations of all ADPs
-    as well as the unit cell parameters from 1st cif file will be assumed
-    uncorrelated and used to estimate the uncertainty of every SI determination.
+    as well as the unit cell parameters from both cif files will be assumed
+    uncorrelated and propagated to first order using analytic derivatives
+    to estimate the uncertainty of every SI determination.
 
     For more information about Similarity Index (SI) itself, please consult
     Whitten and Spackman, Acta Cryst B **62**, 875 (2006)
@@ -74,14 +81,12 @@ def calculate_similarity_indices(cif1_path: str,
         If not specified, the first unused block in said file will be used.
     :param output_path: Path where the output of the program should be written.
     :param uncertainties: If True, propagate the standard deviations of
-        individual ADPs' and cif1's unit cell to estimate SI's uncertainties.
+        individual ADPs and both unit cells to estimate SI's uncertainties.
     :param normalize: If True, equalize the volume of displacement ellipsoids
         by normalizing the determinants of ADP matrices expressed in cartesian
         coordinates. As a result, SI is a function of displacement "shape" only.
     """
 
-    u_type = ufloat_fromstr if uncertainties else cfloat
-
     def initialise_output():
         if output_path is None:
             f_ = None
@@ -122,53 +127,29 @@ def calculate_similarity_indices(cif1_path: str,
     common_labels = find_common_labels(cif_block_1, cif_block_2)
     print(f"# Number of matching atoms found: {len(common_labels)}", file=f)
 
-    def make_adp_fractional_arrays(block):
-        labels = block['_atom_site_aniso_label']
-        u11s = block.get_as_type(key='_atom_site_aniso_U_11', typ=u_type)
-        u22s = block.get_as_type(key='_atom_site_aniso_U_22', typ=u_type)
-        u33s = block.get_as_type(key='_atom_site_aniso_U_33', typ=u_type)
-        u12s = block.get_as_type(key='_atom_site_aniso_U_12', typ=u_type)
-        u13s = block.get_as_type(key='_atom_site_aniso_U_13', typ=u_type)
-        u23s = block.get_as_type(key='_atom_site_aniso_U_23', typ=u_type)
-        return {k: np.array([[u11, u12, u13], [u12, u22, u23], [u13, u23, u33]])
-                for k, u11, u22, u33, u12, u13, u23
-                in zip(labels, u11s, u22s, u33s, u12s, u13s, u23s)}
-    adp_frac_dict_1 = make_adp_fractional_arrays(cif_block_1)
-    adp_frac_dict_2 = make_adp_fractional_arrays(cif_block_2)
-
-    base_frame1 = UBaseFrame() if uncertainties else BaseFrame()
-    base_frame2 = UBaseFrame() if uncertainties else BaseFrame()
-    base_frame1.fill_from_cif_block(cif_block_1)
-    base_frame2.fill_from_cif_block(cif_block_2)
-
-    def calculate_similarity_index(adp_frac_1, adp_frac_2) -> float or UFloat:
-        def adp_frac2cart(adp_frac, base_frame):
-            n = np.diag([base_frame.a_r, base_frame.b_r, base_frame.c_r])
-            return base_frame.A_d.T @ n @ adp_frac @ n @ base_frame.A_d
-        try:
-            adp_cart_1 = adp_frac2cart(adp_frac_1, base_frame1)
-            adp_cart_2 = adp_frac2cart(adp_frac_2, base_frame2)
-            if normalize:
-                adp_cart_1 /= det3x3(adp_cart_1) ** (1 / 3)
-                adp_cart_2 /= det3x3(adp_cart_2) ** (1 / 3)
-            if uncertainties:
-                # `unumpy.matrix` and `unumpy.ulinalg.pinv` are deprecated and
-                # will break soon, but uncertainties is ~no longer supported...
-                adp_inv_1 = unumpy.matrix(adp_cart_1).I
-                adp_inv_2 = unumpy.matrix(adp_cart_2).I
-            else:
-                adp_inv_1 = np.linalg.inv(adp_cart_1)
-                adp_inv_2 = np.linalg.inv(adp_cart_2)
-            r12_num = 2 ** (3 / 2) * det3x3(adp_inv_1 @ adp_inv_2) ** (1 / 4)
-            r12_den = det3x3(adp_inv_1 + adp_inv_2) ** (1 / 2)
-        except ValueError:  # if matrix cannot be inverted, return S = 1.0
-            r12_num = ufloat(0.0, 0) if uncertainties else 0.0
-            r12_den = ufloat(1.0, 0) if uncertainties else 1.0
-        return 100 * (1 - r12_num / r12_den)
+    def make_adp_fractional_stack(block, labels):
+        positions = {k: i for i, k in enumerate(block['_atom_site_aniso_label'])}
+        indices = [positions[k] for k in labels]
+        keys = [f'_atom_site_aniso_U_{ij}' for ij in ADP_COMPONENTS]
+        u, u_su = zip(*[block.get_as_array(k, su=True) for k in keys])
+        u11, u22, u33, u12, u13, u23 = np.stack(u, axis=-1)[indices].T
+        adps = np.stack([u11, u12, u13, u12, u22, u23, u13, u23, u33], axis=-1)
+        return adps.reshape(-1, 3, 3), np.stack(u_su, axis=-1)[indices]
+    adps_frac_1, adps_su_1 = make_adp_fractional_stack(cif_block_1, common_labels)
+    adps_frac_2, adps_su_2 = make_adp_fractional_stack(cif_block_2, common_labels)
+
+    def make_base_frame_with_su(block):
+        base_frame = BaseFrame()
+        base_frame.fill_from_cif_block(block)
+        cell_su = [block.get_as_array(base_frame.IMPORTED_FROM_CIF[k][0],
+                                      default=(0, 0), su=True)[1]
+                   for k in CELL_PARAMETERS]
+        return base_frame, np.array(cell_su, dtype=float)
+    base_frame1, cell_su_1 = make_base_frame_with_su(cif_block_1)
+    base_frame2, cell_su_2 = make_base_frame_with_su(cif_block_2)
 
-    def si_string(si: float or UFloat) -> str:
-        return f'{si:8.4f}' if isinstance(si, float) \
-            else f'{si.n:8.4f} +/- {si.s:8.4f}'
+    def si_string(si: float, si_su: float = None) -> str:
+        return f'{si:8.4f}' if si_su is None else f'{si:8.4f} +/- {si_su:8.4f}'
 
     def si_header():
         return '#  label     SI.n +/-     SI.s' \
@@ -176,22 +157,46 @@ def calculate_similarity_indices(cif1_path: str,
     print(si_header(), file=f)
 
     def calculate_and_print_similarity_indices():
-        sis: dict[Any, float or UFloat] = {}
-        for k in common_labels:
-            sis[k] = calculate_similarity_index(adp_frac_dict_1[k],
-                                                adp_frac_dict_2[k])
-            print(f'{k:>8} {si_string(sis[k])}', file=f)
-        sis_all = [v for k, v in sis.items()]
-        sis_h = [v for k, v in sis.items()
-                 if k[0] == 'H' and k[:2] not in chemical_elements]
-        if sis_all:
-            avg_si_all = sum(sis_all) / len(sis_all)
-            print(f'# avg(*) {si_string(avg_si_all)}', file=f)
+        if uncertainties:
+            sis, jacobians = similarity_indices(
+                adps_frac_1, adps_frac_2, base_frame1, base_frame2,
+                normalize=normalize, jacobians=True)
+        else:
+            sis = similarity_indices(adps_frac_1, adps_frac_2, base_frame1,
+                                     base_frame2, normalize=normalize)
+
+        def average_with_su(mask):
+            """Average SI over `mask`, propagating errors of shared cells"""
+            avg = np.mean(sis[mask])
+            if not uncertainties:
+                return avg, None
+            n = np.count_nonzero(mask)
+            var = sum(np.sum((jacobians[k][mask] * su / n) ** 2)
+                      for k, su in (('adps_1', adps_su_1[mask]),
+                                    ('adps_2', adps_su_2[mask])))
+            var += sum(np.sum((np.mean(jacobians[k][mask], axis=0) * su) ** 2)
+                       for k, su in (('cell_1', cell_su_1),
+                                     ('cell_2', cell_su_2)))
+            return avg, np.sqrt(var)
+
+        sis_su = [None] * len(sis)
+        if uncertainties:
+            sis_su = np.sqrt(np.sum((jacobians['adps_1'] * adps_su_1) ** 2 +
+                                    (jacobians['adps_2'] * adps_su_2) ** 2 +
+                                    (jacobians['cell_1'] * cell_su_1) ** 2 +
+                                    (jacobians['cell_2'] * cell_su_2) ** 2,
+                                    axis=1))
+        for k, si, si_su in zip(common_labels, sis, sis_su):
+            print(f'{k:>8} {si_string(si, si_su)}', file=f)
+        mask_all = np.ones(len(common_labels), dtype=bool)
+        mask_h = np.array([k[0] == 'H' and k[:2] not in chemical_elements
+                           for k in common_labels], dtype=bool)
+        if np.any(mask_all):
+            print(f'# avg(*) {si_string(*average_with_su(mask_all))}', file=f)
         else:
             print(f'# No atoms with matching names found', file=f)
-        if sis_h:
-            avg_si_h = sum(sis_h) / len(sis_h)
-            print(f'# avg(H) {si_string(avg_si_h)}', file=f)
+        if np.any(mask_h):
+            print(f'# avg(H) {si_string(*average_with_su(mask_h))}', file=f)
     calculate_and_print_similarity_indices()
 
     def terminate_output():
@@ -200,6 +205,122 @@ def calculate_similarity_indices(cif1_path: str,
     terminate_output()
 
 
+def similarity_indices(adps_frac_1: np.ndarray,
+                       adps_frac_2: np.ndarray,
+                       base_frame_1: BaseFrame,
+                       base_frame_2: BaseFrame,
+                       normalize: bool = False,
+                       jacobians: bool = False,
+                       ) -> Union[np.ndarray, tuple[np.ndarray, dict]]:
+    """
+    Calculate Similarity Indices (SI) between many pairs of Anisotropic
+    Displacement Parameters at once. ADPs given in fractional coordinates
+    are converted to cartesian using matrices of respective `base_frame`,
+    and SI is evaluated from their batched determinants.
+    Pairs where either ADP matrix is not positive definite get SI = 100.
+
+    If `jacobians`, return also analytic partial derivatives of every SI
+    with respect to its independent ADP components, ordered as in
+    :data:`ADP_COMPONENTS`, and to unit cell parameters of both frames,
+    ordered as in :data:`CELL_PARAMETERS`, with angles in degrees.
+    These can be used to propagate uncertainties to first order.
+
+    :param adps_frac_1: (N, 3, 3) array of ADPs in first base frame
+    :param adps_frac_2: (N, 3, 3) array of ADPs in second base frame
+    :param base_frame_1: base frame describing unit cell of `adps_frac_1`
+    :param base_frame_2: base frame describing unit cell of `adps_frac_2`
+    :param normalize: If True, equalize the volume of displacement ellipsoids
+        by normalizing the determinants of ADP matrices expressed in cartesian
+        coordinates. As a result, SI is a function of displacement "shape" only.
+    :param jacobians: If True, return also a dict with (N, 6) arrays of
+        derivatives of SI with respect to "adps_1", "adps_2", "cell_1",
+        and "cell_2".
+    :return: (N, ) array of similarity indices of all ADP pairs
+        and, if `jacobians`, a dict of their derivatives
+    """
+    adps_frac_1 = np.asarray(adps_frac_1, dtype=float)
+    adps_frac_2 = np.asarray(adps_frac_2, dtype=float)
+    m_1 = _adp_frac2cart_matrix(base_frame_1)
+    m_2 = _adp_frac2cart_matrix(base_frame_2)
+    adps_cart_1 = np.einsum('ji,njk,kl->nil', m_1, adps_frac_1, m_1, optimize=True)
+    adps_cart_2 = np.einsum('ji,njk,kl->nil', m_2, adps_frac_2, m_2, optimize=True)
+    dets_1 = lin.det(adps_cart_1)
+    dets_2 = lin.det(adps_cart_2)
+    valid = (dets_1 > 0) & (dets_2 > 0)
+    dets_1, dets_2 = np.where(valid, dets_1, 1), np.where(valid, dets_2, 1)
+    scales_1 = scales_2 = np.ones_like(dets_1)
+    if normalize:
+        scales_1, scales_2 = np.cbrt(dets_1), np.cbrt(dets_2)
+    adps_norm_1 = adps_cart_1 / scales_1[:, np.newaxis, np.newaxis]
+    adps_norm_2 = adps_cart_2 / scales_2[:, np.newaxis, np.newaxis]
+    # det(U1^-1 + U2^-1) = det(U1 + U2) / (det U1 * det U2), so no inverse
+    # is needed: R12 = 2^(3/2) (det U1 * det U2)^(1/4) / det(U1 + U2)^(1/2)
+    dets_sum = lin.det(adps_norm_1 + adps_norm_2)
+    valid &= dets_sum > 0
+    dets_sum = np.where(valid, dets_sum, 1)
+    r12_num = 2 ** (3 / 2) * (dets_1 * dets_2 / (scales_1 * scales_2) ** 3) ** (1 / 4)
+    r12 = r12_num / dets_sum ** (1 / 2)
+    # R12 <= 1 analytically; clip round-off so identical ADPs yield SI = 0
+    sis = np.where(valid, np.maximum(100 * (1 - r12), 0.0), 100.0)
+    if not jacobians:
+        return sis
+
+    # d ln(det X) = tr(X^-1 dX); gradients g satisfy d SI = tr(g dU_cart)
+    eye = np.eye(3)
+    inv_sum = lin.inv(np.where(valid[:, np.newaxis, np.newaxis],
+                               adps_norm_1 + adps_norm_2, eye))
+    gradients = []
+    for adps_cart, adps_norm, scales in ((adps_cart_1, adps_norm_1, scales_1),
+                                         (adps_cart_2, adps_norm_2, scales_2)):
+        inv = lin.inv(np.where(valid[:, np.newaxis, np.newaxis], adps_cart, eye))
+        if normalize:
+            trace = np.einsum('nij,nji->n', inv_sum, adps_norm)
+            d_ln_r12 = -(inv_sum / scales[:, np.newaxis, np.newaxis]
+                         - trace[:, np.newaxis, np.newaxis] * inv / 3) / 2
+        else:
+            d_ln_r12 = inv / 4 - inv_sum / 2
+        gradients.append(-100 * (r12 * valid)[:, np.newaxis, np.newaxis]
+                         * d_ln_r12)
+
+    out = {}
+    for i, (m, adps_frac, grad, base_frame) in enumerate(
+            ((m_1, adps_frac_1, gradients[0], base_frame_1),
+             (m_2, adps_frac_2, gradients[1], base_frame_2)), start=1):
+        h = m @ grad @ m.T
+        out[f'adps_{i}'] = np.stack([h[:, 0, 0], h[:, 1, 1], h[:, 2, 2],
+                                     2 * h[:, 0, 1], 2 * h[:, 0, 2],
+                                     2 * h[:, 1, 2]], axis=-1)
+        d_m = _adp_frac2cart_matrix_derivatives(base_frame)
+        k = grad @ m.T @ adps_frac
+        out[f'cell_{i}'] = 2 * np.einsum('nij,pji->np', k, d_m)
+    return sis, out
+
+
+def _adp_frac2cart_matrix(base_frame: BaseFrame) -> np.ndarray:
+    """Matrix M converting fractional ADPs U to cartesian as M.T @ U @ M"""
+    n = np.diag([base_frame.a_r, base_frame.b_r, base_frame.c_r])
+    return n @ base_frame.A_d
+
+
+def _adp_frac2cart_matrix_derivatives(base_frame: BaseFrame) -> np.ndarray:
+    """(6, 3, 3) central-difference derivatives of `_adp_frac2cart_matrix`
+    with respect to cell parameters, ordered as in `CELL_PARAMETERS`"""
+    cell = np.array([base_frame.a_d, base_frame.b_d, base_frame.c_d,
+                     np.rad2deg(base_frame.al_d), np.rad2deg(base_frame.be_d),
+                     np.rad2deg(base_frame.ga_d)])
+    steps = np.array([1e-6, 1e-6, 1e-6, 1e-5, 1e-5, 1e-5]) * \
+        np.array([cell[0], cell[1], cell[2], 1, 1, 1])
+    derivatives = np.zeros((6, 3, 3))
+    for p, step in enumerate(steps):
+        for sign in (1, -1):
+            shifted = cell.copy()
+            shifted[p] += sign * step
+            frame = BaseFrame()
+            frame.edit_cell(**dict(zip(CELL_PARAMETERS, shifted)))
+            derivatives[p] += sign * _adp_frac2cart_matrix(frame) / (2 * step)
+    return derivatives
+
+
 def animate_similarity_index(u_diag: Iterable,
                              transformations: list[np.ndarray],
                              output_path: str) -> None:
@@ -234,7 +355,7 @@ def animate_similarity_index(u_diag: Iterable,
     fps = 10
     steps = len(transformations)
 
-    def calculate_similarity_index(adp_frac_1, adp_frac_2) -> float or UFloat:
+    def calculate_similarity_index(adp_frac_1, adp_frac_2) -> float:
         base_frame = BaseFrame()
 
         def adp_frac2cart(adp_frac):
@@ -1,3 +1,5 @@
+import time
+
 import numpy as np
 from matplotlib import pyplot, cm
 from scipy.optimize import minimize
@@ -225,6 +227,64 @@ def calculate_sample_form_factors(a, b, c, al, be, ga, space_group, res_path):
         print(f'{_hkl}: {_f2:12f} --- {_f}')
 
 
+def benchmark_form_factors(a, b, c, al, be, ga, space_group,
+                           n_atoms=100, resolution=0.8, oversampling=1.5):
+    """
+    Compare the time and results of direct summation and FFT-based
+    calculation of form factors for a random structure of C, N, and O atoms
+    with anisotropic displacement parameters and print the outcome.
+
+    :param a: Unit cell parameter *a* in Angstrom.
+    :type a: float
+    :param b: Unit cell parameter *b* in Angstrom.
+    :type b: float
+    :param c: Unit cell parameter *c* in Angstrom.
+    :type c: float
+    :param al: Unit cell parameter *alpha* in degrees.
+    :type al: float
+    :param be: Unit cell parameter *beta* in degrees.
+    :type be: float
+    :param ga: Unit cell parameter *gamma* in degrees.
+    :type ga: float
+    :param space_group: Short Hermann-Mauguin name or index of space group.
+        For details see table in hikari.symmetry.space_groups.
+    :type space_group: str or int
+    :param n_atoms: Number of atoms in the asymmetric unit.
+    :type n_atoms: int
+    :param resolution: Resolution of calculated reflections in Angstrom.
+    :type resolution: float
+    :param oversampling: Grid oversampling used by the FFT-based method.
+    :type oversampling: float
+    :return: None
+    :rtype: None
+    """
+    rng = np.random.default_rng(seed=0)
+    r = ResFrame()
+    lines = ['SFAC C N O', 'FVAR 1.0']
+    for i in range(n_atoms):
+        xyz = ' '.join(f'{x:.6f}' for x in rng.random(3))
+        u_scale = rng.uniform(0.8, 1.2)
+        u = ' '.join(f'{u * u_scale:.6f}'
+                     for u in (.02, .025, .03, .002, -.001, .003))
+        lines.append(f'{"CNO"[i % 3]}{i} {i % 3 + 1} {xyz} 11.0 {u}')
+    r.parse('\n'.join(lines))
+    r.edit_cell(a=a, b=b, c=c, al=al, be=be, ga=ga)
+    h = HklFrame()
+    h.edit_cell(a=a, b=b, c=c, al=al, be=be, ga=ga)
+    h.fill(radius=1 / resolution)
+    hkl = h.table.loc[:, ['h', 'k', 'l']].to_numpy()
+    time0 = time.perf_counter()
+    f_direct = r.form_factor(hkl, SG[space_group])
+    time1 = time.perf_counter()
+    f_fft = r.form_factor_fft(hkl, SG[space_group], oversampling=oversampling)
+    time2 = time.perf_counter()
+    error = np.abs(f_fft - f_direct).max() / np.abs(f_direct).max()
+    print(f'Reflections:    {len(hkl):d}')
+    print(f'Direct sum:     {time1 - time0:.3f} s')
+    print(f'FFT:            {time2 - time1:.3f} s')
+    print(f'Max rel. error: {error:.3e}')
+
+
 if __name__ == '__main__':
     # calculate_sample_form_factors(a=5.64109, b=5.64109, c=5.64109,
     #                               al=90, be=90, ga=90, space_group='Fm-3m',
@@ -0,0 +1,193 @@
+"""
+This sub-module contains scripts made to simulate single crystal diffraction
+experiments. Synthetic .hkl datasets generated based on a known structure
+model can be used to benchmark data collection strategies, e.g. in DAC,
+or to test the performance of other scripts on data of any size.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from hikari.dataframes import HklFrame, ResFrame
+from hikari.symmetry import SG
+from hikari.utility import make_abspath
+
+
+NOISE_MODELS = ('none', 'gaussian', 'poisson')
+"""Names of noise models accepted by :func:`simulate_dataset`"""
+
+
+def simulate_dataset(a, b, c, al, be, ga,
+                     space_group='P1',
+                     res_path='shelx.res',
+                     wavelength='MoKa',
+                     resolution=None,
+                     opening_angle=None,
+                     orientation=((1, 0, 0), (0, 1, 0), (0, 0, 1)),
+                     vector=None,
+                     noise='poisson',
+                     scale=1.0,
+                     background=1.0,
+                     relative_error=0.0,
+                     batches=None,
+                     crystals=None,
+                     method='fft',
+                     chunk_size=100_000,
+                     workers=1,
+                     seed=None,
+                     output_path=None,
+                     output_format='shelx_4'):
+    r"""
+    Simulate a single crystal diffraction dataset for a given .res model.
+    All reflections up to given resolution are generated, optionally trimmed
+    to the region accessible in a diamond anvil cell, assigned intensities
+    proportional to squared structure factors and perturbed with noise.
+
+    Reflections are processed in chunks of `chunk_size`, which can be
+    distributed among many `workers` processes. Every chunk uses its own
+    random generator spawned from `seed`, so that the result does not depend
+    on the number of workers. Intensity uncertainties are estimated as
+    *si = sqrt(I_true + 2 \* background + (relative_error \* I_true) \*\* 2)*.
+
+    :param a: Unit cell parameter *a* in Angstrom.
+    :type a: float
+    :param b: Unit cell parameter *b* in Angstrom.
+    :type b: float
+    :param c: Unit cell parameter *c* in Angstrom.
+    :type c: float
+    :param al: Unit cell parameter *alpha* in degrees.
+    :type al: float
+    :param be: Unit cell parameter *beta* in degrees.
+    :type be: float
+    :param ga: Unit cell parameter *gamma* in degrees.
+    :type ga: float
+    :param space_group: Short Hermann-Mauguin name or index of space group.
+        For details see table in hikari.symmetry.space_groups.
+    :type space_group: str or int
+    :param res_path: Absolute or relative path to the input .res file.
+    :type res_path: str
+    :param wavelength: Wavelength of radiation utilised in experiment.
+    :type wavelength: float or str
+    :param resolution: If given, limit data resolution to this d-spacing
+        in Angstrom. By default, generate all reflections in limiting sphere.
+    :type resolution: float
+    :param opening_angle: If given, value of single opening angle as defined
+        in :meth:`hikari.dataframes.HklFrame.dac_trim`.
+    :type opening_angle: float
+    :param orientation: Crystal orientation as defined in
+        :class:`hikari.dataframes.BaseFrame`
+    :type orientation: tuple or numpy.array
+    :param vector: If given, overwrite orientation to provide information
+        about crystal placement in dac,
+        as defined in :meth:`hikari.dataframes.HklFrame.dac_trim`.
+    :type vector: tuple
+    :param noise: Noise model, one of :data:`NOISE_MODELS`: "none" to keep
+        true intensities, "gaussian" to draw intensities from normal
+        distribution with standard deviation `si`, or "poisson" to draw
+        counts from Poisson distribution of `I_true + background`, subtract
+        background and add Gaussian noise of `relative_error * I_true`.
+    :type noise: str
+    :param scale: Number of counts per squared electron of structure factor.
+    :type scale: float
+    :param background: Expected number of background counts per reflection.
+    :type background: float
+    :param relative_error: Relative error of intensities, e.g. due to
+        scaling and absorption, added in quadrature to counting error.
+    :type relative_error: float
+    :param batches: If given, randomly assign reflections to this many
+        batches, numbered from 1, and store them in "b" column.
+    :type batches: int
+    :param crystals: If given, randomly assign reflections to this many
+        crystals, numbered from 1, and store them in "c" column.
+    :type crystals: int
+    :param method: Method used to calculate form factors: "fft" to use
+        :meth:`hikari.dataframes.ResFrame.form_factor_fft` once for
+        all reflections, or "direct" to use
+        :meth:`hikari.dataframes.ResFrame.form_factor` for every chunk.
+    :type method: str
+    :param chunk_size: Number of reflections processed at once.
+    :type chunk_size: int
+    :param workers: Number of processes to use; if None, all CPUs.
+    :type workers: int
+    :param seed: Seed of the random number generator.
+    :type seed: int
+    :param output_path: If given, path to the output .hkl file.
+    :type output_path: str
+    :param output_format: Format of the output .hkl file. For reference see
+        :meth:`hikari.dataframes.HklFrame.interpret_hkl_format`.
+    :type output_format: int or str or dict
+    :return: HklFrame with simulated reflections
+    :rtype: hikari.dataframes.HklFrame
+    """
+    if noise not in NOISE_MODELS:
+        raise ValueError(f'Unknown noise model {noise}, use: {NOISE_MODELS}')
+    if method not in ('fft', 'direct'):
+        raise ValueError(f'Unknown method {method}, use "fft" or "direct"')
+    r = ResFrame()
+    r.read(make_abspath(res_path))
+    r.edit_cell(a=a, b=b, c=c, al=al, be=be, ga=ga)
+    sg = SG[space_group]
+    p = HklFrame()
+    p.edit_cell(a=a, b=b, c=c, al=al, be=be, ga=ga)
+    p.la = wavelength
+    p.orientation = np.array(orientation)
+    radius = p.r_lim if resolution is None else min(p.r_lim, 1 / resolution)
+    p.fill(radius=radius)
+    if opening_angle is not None:
+        p.dac_trim(opening_angle=opening_angle, vector=vector)
+    hkl = p.table.loc[:, ['h', 'k', 'l']].to_numpy()
+
+    starts = range(0, len(hkl), chunk_size)
+    hkl_chunks = [hkl[s:s + chunk_size] for s in starts]
+    if method == 'fft':
+        f = r.form_factor_fft(hkl, sg) if len(hkl) else np.zeros(0)
+        f2_chunks = [np.abs(f[s:s + chunk_size]) ** 2 for s in starts]
+    else:
+        f2_chunks = [None] * len(hkl_chunks)
+    seeds = np.random.SeedSequence(seed).spawn(len(hkl_chunks))
+    settings = dict(res_frame=r, space_group=sg, noise=noise, scale=scale,
+                    background=background, relative_error=relative_error,
+                    batches=batches, crystals=crystals)
+    args = (hkl_chunks, f2_chunks, seeds, [settings] * len(hkl_chunks))
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        outcomes = list(map(_simulate_chunk, *args))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as ex:
+            outcomes = list(ex.map(_simulate_chunk, *args))
+
+    columns = {'h': hkl[:, 0], 'k': hkl[:, 1], 'l': hkl[:, 2],
+               'I': np.zeros(0), 'si': np.zeros(0)}
+    for key in outcomes[0] if outcomes else []:
+        columns[key] = np.concatenate([o[key] for o in outcomes])
+    p.from_dict(columns)
+    if output_path is not None:
+        p.write(hkl_path=make_abspath(output_path), hkl_format=output_format)
+    return p
+
+
+def _simulate_chunk(hkl, f_squared, seed, settings):
+    """Simulate a chunk of data for `simulate_dataset`; return columns dict"""
+    rng = np.random.default_rng(seed)
+    if f_squared is None:
+        f = settings['res_frame'].form_factor(hkl, settings['space_group'])
+        f_squared = np.abs(f) ** 2
+    i_true = settings['scale'] * f_squared
+    background = settings['background']
+    relative_error = settings['relative_error']
+    si = np.sqrt(i_true + 2 * background + (relative_error * i_true) ** 2)
+    if settings['noise'] == 'gaussian':
+        i = rng.normal(i_true, si)
+    elif settings['noise'] == 'poisson':
+        i = rng.poisson(i_true + background) - background
+        i = i + rng.normal(0.0, relative_error * i_true)
+    else:
+        i = i_true
+    columns = {'I': i, 'si': si}
+    if settings['batches'] is not None:
+        columns['b'] = rng.integers(1, settings['batches'] + 1, len(hkl))
+    if settings['crystals'] is not None:
+        columns['c'] = rng.integers(1, settings['crystals'] + 1, len(hkl))
+    return columns
@@ -1,6 +1,7 @@
+from collections import Counter
 import warnings
 from copy import deepcopy
-from functools import reduce
+from functools import cached_property, lru_cache, reduce
 import json
 from operator import and_
 from pathlib import Path
@@ -89,12 +90,10 @@ class GroupCatalogKeyGroup(GroupCatalogKey):
 
     @classmethod
     def construct(cls, table: pd.DataFrame) -> pd.Series:
-        groups = []
-        for n, name, symbol in zip(table['number'], table['HM'], table['Hall']):
-            group = Group.from_hall_symbol(symbol)
+        groups = Group.from_hall_symbols(table['Hall'])
+        for group, n, name in zip(groups, table['number'], table['HM']):
             group.name = name
             group.number = n
-            groups.append(group)
         return pd.Series(groups)
 
 
@@ -109,17 +108,30 @@ class GroupCatalogKeyHMShort(GroupCatalogKey):
         return table['HM'].str.replace('_', '')
 
 
+class GroupCatalogKeyPointGroup(GroupCatalogKey):
+    """`PG` number of crystal class (point group) that the group belongs to"""
+    name = 'point_group'
+    dependencies = [GroupCatalogKeyGroup]
+    dtype = 'int8'
+
+    @classmethod
+    def construct(cls, table: pd.DataFrame) -> pd.Series:
+        numbers = _crystal_class_numbers()
+        return pd.Series([numbers[_crystal_class_signature(g.rotations)]
+                          for g in table['group']])
+
+
 class GroupCatalogKeyHMSimple(GroupCatalogKey):
     """`HM_short` without setting and with `1` removed for monoclinic system"""
     name = 'HM_simple'
     accessor_priority = 130.
-    dependencies = [GroupCatalogKeyHM, GroupCatalogKeyHMShort, GroupCatalogKeyGroup]
+    dependencies = [GroupCatalogKeyHM, GroupCatalogKeyHMShort,
+                    GroupCatalogKeyPointGroup]
 
     @classmethod
     def construct(cls, table: pd.DataFrame) -> pd.Series:
         has_colon = table['HM'].str.contains(':')
-        gsm = Group.System.monoclinic
-        monoclinic = np.array([g.system == gsm for g in table['group']])
+        monoclinic = table['point_group'].isin([3, 4, 5]).to_numpy()
         simple = table['HM_short'].copy()
         simple.loc[has_colon] = simple.loc[has_colon].str.replace(r'\:.', '', regex=True)
         simple.loc[monoclinic] = '_' + table.loc[monoclinic, 'HM']  # needed for PG
@@ -148,15 +160,58 @@ class GroupCatalogKeyStandard(GroupCatalogKey):
         return table['number'].rolling(2).var().ne(0)
 
 
+class GroupCatalogKeyLaueClass(GroupCatalogKey):
+    """`PG` number of centrosymmetric Laue class that the group belongs to"""
+    name = 'laue_class'
+    dependencies = [GroupCatalogKeyGroup]
+    dtype = 'int8'
+
+    @classmethod
+    def construct(cls, table: pd.DataFrame) -> pd.Series:
+        numbers = _crystal_class_numbers()
+        return pd.Series([numbers[_crystal_class_signature(
+            np.concatenate([g.rotations, -g.rotations]))]
+            for g in table['group']])
+
+
 # ~~~~~~~~~~~~~~~~~~~~~~~~~ CATALOG HELPER FUNCTIONS ~~~~~~~~~~~~~~~~~~~~~~~~~ #
 
 
-def _resolve_construct_order(keys: list[GroupCatalogKey]) -> list[GroupCatalogKey]:
+def _crystal_class_signature(rotations: np.ndarray) -> tuple:
+    """
+    Return a sorted tuple of ((determinant, trace), count) pairs for all
+    unique `rotations`. The signature is unique for each of 32 crystal classes,
+    is independent of the setting, and is the same for direct and reciprocal
+    point group, since the trace of a rotation and its inverse is equal.
+    """
+    unique = np.unique(rotations.reshape(-1, 9), axis=0).reshape(-1, 3, 3)
+    dets = np.rint(np.linalg.det(unique)).astype(int).tolist()
+    traces = np.trace(unique, axis1=1, axis2=2).tolist()
+    return tuple(sorted(Counter(zip(dets, traces)).items()))
+
+
+@lru_cache(maxsize=1)
+def _crystal_class_numbers() -> dict[tuple, int]:
+    """Map `_crystal_class_signature` to the number of point group in `PG`"""
+    table = point_groups_dataframe
+    table = table if 'n_c' in table else table.reset_index()
+    numbers = {}
+    for n_c, hall in zip(table['n_c'], table['Hall']):
+        number = int(str(n_c).partition(':')[0])
+        rotations = Group.from_hall_symbol(hall).rotations
+        numbers[_crystal_class_signature(rotations)] = number
+    return numbers
+
+
+@lru_cache(maxsize=None)
+def _resolve_construct_order(keys: tuple[GroupCatalogKey, ...]) \
+        -> tuple[GroupCatalogKey, ...]:
     """
     Return `GroupCatalogKey`s in an order that warrants that
-    key's dependencies are constructed before it
+    key's dependencies are constructed before it. Keys are classes,
+    so the order is resolved only once for every tuple of keys.
     """
-    unordered = deepcopy(keys)
+    unordered = list(keys)
     ordered = []
     def find_constructable(unordered_: list[GroupCatalogKey]) -> GroupCatalogKey:
         for key_i, key in enumerate(unordered_):
@@ -165,7 +220,7 @@ def _resolve_construct_order(keys: list[GroupCatalogKey]) -> list[GroupCatalogKe
         raise RuntimeError('Circular dependency when creating `GroupCatalog`')
     while len(ordered) < len(keys):
         ordered.append(find_constructable(unordered))
-    return ordered
+    return tuple(ordered)
 
 
 # ~~~~~~~~~~~~~~~~~~~~~~~ CATALOG JSON ENCODER/DECODER ~~~~~~~~~~~~~~~~~~~~~~~ #
@@ -198,11 +253,17 @@ class GroupCatalogJSONDecoder(json.JSONDecoder):
         _type = obj['_type']
         if _type == 'GroupCatalog':
             records = []
+            operations = {}  # codes repeat across groups, parse each only once
+
+            def from_code(code: str) -> BoundedOperation:
+                if code not in operations:
+                    operations[code] = BoundedOperation.from_code(code)
+                return operations[code]
             for record in obj['table']:
                 group = record['group']
                 group = Group.from_generators_operations(
-                    generators=[BoundedOperation.from_code(c) for c in group['generators']],
-                    operations=[BoundedOperation.from_code(c) for c in group['operations']])
+                    generators=[from_code(c) for c in group['generators']],
+                    operations=[from_code(c) for c in group['operations']])
                 group.name = record['HM']
                 group.number = record['number']
                 record.update({'group': group})
@@ -250,6 +311,8 @@ class GroupCatalog:
         GroupCatalogKeyHMSimple,
         GroupCatalogKeyHMNumbered,
         GroupCatalogKeyStandard,
+        GroupCatalogKeyPointGroup,
+        GroupCatalogKeyLaueClass,
     ]
     REST_COL_FORMAT = {
         'n_c': '7.7s',
@@ -262,16 +325,29 @@ class GroupCatalog:
     def __init__(self, table: pd.DataFrame) -> None:
         if 'n_c' not in table and table.index.name == 'n_c':
             table.reset_index(inplace=True)
-        for key in _resolve_construct_order(self.KEYS):
+        constructed = []
+        for key in _resolve_construct_order(tuple(self.KEYS)):
             if key.name not in table:
                 table[key.name] = key.construct(table)
-            gck = {k.name: k for k in self.KEYS}[key.name]
-            if not (table[key.name].dtype == gck.dtype or (
-                    isinstance(gck.dtype, type) and
-                    all(isinstance(v, gck.dtype) for v in table[key.name]))):
-                table[key.name] = table[key.name].astype(gck.dtype)
+                constructed.append(key.name)
+            column = table[key.name]
+            if isinstance(key.dtype, type) and not issubclass(key.dtype, np.generic):
+                if column.dtype != object:  # python objects are never cast
+                    table[key.name] = column.astype(object)
+            elif column.dtype != key.dtype:
+                table[key.name] = column.astype(key.dtype)
+        if constructed:  # new columns follow `KEYS` order, not construct order
+            constructed = [k.name for k in self.KEYS if k.name in constructed]
+            table = table[[c for c in table if c not in constructed] + constructed]
         self.table: pd.DataFrame = table
 
+    @classmethod
+    def _from_table(cls, table: pd.DataFrame) -> 'GroupCatalog':
+        """Wrap a `table` with all key columns already present and validated"""
+        new_catalog = cls.__new__(cls)
+        new_catalog.table = table
+        return new_catalog
+
     def __eq__(self, other):
         if isinstance(other, self.__class__):
             return self.table.equals(other.table)
@@ -316,8 +392,93 @@ class GroupCatalog:
     @property
     def standard(self) -> 'GroupCatalog':
         """A subset of current catalog with standard-setting groups only"""
-        standard = deepcopy(self.table[self.table['standard']]).reset_index(drop=True)
-        return self.__class__(standard)
+        return self._subset(self.table['standard'].to_numpy())
+
+    def transform(self, m: np.ndarray) -> 'GroupCatalog':
+        """
+        A copy of current catalog with all groups transformed using a 4x4
+        matrix `m`; see `Group.transform`. All groups are transformed at once.
+        Other columns, including `Hall` and `HM` symbols, are kept unchanged.
+        """
+        table = self.table.copy(deep=False)
+        groups = Group.transform_groups(list(table['group']), np.asarray(m))[0]
+        table['group'] = pd.Series(groups, index=table.index, dtype=object)
+        return self._from_table(table)
+
+    # ~~~~~~~~~~~~~~~~~~~~~~~~~ SUBGROUP RELATIONS ~~~~~~~~~~~~~~~~~~~~~~~~~~ #
+
+    @cached_property
+    def _code_membership(self) -> tuple[np.ndarray, np.ndarray]:
+        """Sorted unique operation codes & (n_groups, n_codes) bool membership"""
+        codes = [g.operation_codes for g in self.table['group']]
+        unique = np.unique(np.concatenate(codes)) if codes \
+            else np.array([], dtype=np.int64)
+        membership = np.zeros((len(codes), len(unique)), dtype=bool)
+        for i, c in enumerate(codes):
+            membership[i, np.searchsorted(unique, c)] = True
+        return unique, membership
+
+    @cached_property
+    def _subgroup_lattice(self) -> np.ndarray:
+        """Bool (n, n) array with `[i, j]` True if group i < group j (proper)"""
+        membership = self._code_membership[1].astype(np.float32)
+        missing = membership @ (1. - membership).T
+        subset = missing == 0
+        return subset & ~subset.T
+
+    def _is_subset_of(self, group: Group) -> np.ndarray:
+        """Bool (n,) array, True where catalog group is a subset of `group`"""
+        unique, membership = self._code_membership
+        present = np.isin(unique, group.operation_codes)
+        return ~(membership & ~present).any(axis=1)
+
+    def _is_superset_of(self, group: Group) -> np.ndarray:
+        """Bool (n,) array, True where catalog group is a superset of `group`"""
+        unique, membership = self._code_membership
+        codes = group.operation_codes
+        if not np.isin(codes, unique).all():
+            return np.zeros(len(self), dtype=bool)
+        return membership[:, np.searchsorted(unique, codes)].all(axis=1)
+
+    def _subset(self, mask: np.ndarray) -> 'GroupCatalog':
+        """
+        A catalog with rows of current one selected by bool `mask`.
+        Selected table columns are copied, but the `Group` objects in them
+        are shared by reference and not re-validated or re-generated.
+        """
+        return self._from_table(self.table[mask].reset_index(drop=True))
+
+    def subgroups(self, group: Group) -> 'GroupCatalog':
+        """
+        A subset of current catalog with all proper subgroups of `group`.
+        Only groups expressed in the same setting and origin are recognised,
+        as the relation is established by comparing the sets of operations.
+        """
+        orders = np.array([g.order for g in self.table['group']])
+        return self._subset(self._is_subset_of(group) & (orders < group.order))
+
+    def supergroups(self, group: Group) -> 'GroupCatalog':
+        """A subset of current catalog with all proper supergroups of `group`"""
+        orders = np.array([g.order for g in self.table['group']])
+        return self._subset(self._is_superset_of(group) & (orders > group.order))
+
+    def maximal_subgroups(self, group: Group) -> 'GroupCatalog':
+        """
+        A subset of current catalog with maximal subgroups of `group`, i.e.
+        its proper subgroups which are not a proper subgroup of one another.
+        Relies on a subgroup lattice of the catalog computed on first use.
+        """
+        orders = np.array([g.order for g in self.table['group']])
+        subs = self._is_subset_of(group) & (orders < group.order)
+        non_maximal = self._subgroup_lattice[:, subs].any(axis=1)
+        return self._subset(subs & ~non_maximal)
+
+    def minimal_supergroups(self, group: Group) -> 'GroupCatalog':
+        """A subset of current catalog with minimal supergroups of `group`"""
+        orders = np.array([g.order for g in self.table['group']])
+        sups = self._is_superset_of(group) & (orders > group.order)
+        non_minimal = self._subgroup_lattice[sups, :].any(axis=0)
+        return self._subset(sups & ~non_minimal)
 
     # ~~~~~~~~~~~~~~~~~~~~ DUCK-TYPING DICT-LIKE INTERFACE ~~~~~~~~~~~~~~~~~~~ #
 
@@ -419,6 +580,8 @@ localize the correct space group. The following keyword arguments can be used:
   - `HM_numbered` - "number: Short Hermann-Mauguin symbol" string
   - `Hall` - Full Hall symbol\*
   - `standard` - True for groups in standard setting only
+  - `point_group` - number of group's crystal class in `PG`
+  - `laue_class` - number of group's Laue class in `PG`
 
 The keywords marked with "*" are called "accessors" and can be used to `get`
 the group using bracket notation `get[accessor]`. If `get` finds ambiguity,
@@ -538,6 +701,8 @@ localize the correct space group. The following keyword arguments can be used:
   - `HM_numbered` - "number: Short Hermann-Mauguin symbol" string
   - `Hall` - Full Hall symbol\*
   - `standard` - True for groups in standard setting only
+  - `point_group` - number of group's crystal class in `PG`
+  - `laue_class` - number of group's Laue class in `PG`
 
 The keywords marked with "*" are called "accessors" and can be used to `get`
 the group using bracket notation `get[accessor]`.
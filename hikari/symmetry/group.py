@@ -2,9 +2,10 @@
 This file contains class definition and necessary tools for constructing
 and evaluating all symmetry groups.
 """
+from functools import cached_property, lru_cache
 from itertools import product as itertools_product
 from enum import Enum
-from typing import Union
+from typing import Iterable, Union
 
 import numpy as np
 from numpy.random.mtrand import Sequence
@@ -14,6 +15,51 @@ from hikari.symmetry.hall import HallSymbol
 from hikari.utility.list_tools import find_best
 
 
+def _pack_operations(rotations: np.ndarray, translations24: np.ndarray):
+    """
+    Pack (n, 3, 3) rotations and (n, 3) translations in 1/24ths into (n,)
+    int64 array. Each of 9 rotation elements, offset by 8, occupies 4 bits,
+    while 3 translation elements use base 24, so that two operations
+    share a code if and only if they are equal.
+    """
+    tf = rotations.reshape(-1, 9).astype(np.int64) + 8
+    if np.any(tf < 0) or np.any(tf > 15):
+        raise ValueError('Rotation elements outside -8 to 7 can\'t be packed')
+    tl = translations24.astype(np.int64) % 24
+    tf_codes = tf @ (16 ** np.arange(9, dtype=np.int64))
+    tl_codes = tl @ (24 ** np.arange(3, dtype=np.int64))
+    return tf_codes * 24 ** 3 + tl_codes
+
+
+@lru_cache(maxsize=None)
+def _closure(generators: tuple[bytes, ...]) -> np.ndarray:
+    """
+    Return a read-only (n, 4, 4) int array with augmented matrices, with
+    translations in 1/24ths, of all operations of a group generated by
+    `generators`, each given as bytes of such an int64 matrix. Closures of
+    all leading subsets of generators are cached, so that groups sharing
+    their first generators, e.g. lattice and inversion, share the work.
+    """
+    if not generators:
+        return np.eye(4, dtype=np.int64)[np.newaxis]
+    last = np.frombuffer(generators[-1], dtype=np.int64).reshape(1, 4, 4)
+    operations = np.concatenate([_closure(generators[:-1]), last])
+    while True:
+        products = np.einsum('aij,bjk->abik', operations, operations)
+        products = products.reshape(-1, 4, 4)
+        products[:, :3, 3] %= 24
+        candidates = np.concatenate([operations, products])
+        codes = _pack_operations(candidates[:, :3, :3], candidates[:, :3, 3])
+        _, first = np.unique(codes, return_index=True)
+        if len(first) == len(operations):
+            break
+        if len(first) > 200:
+            raise ValueError('Generated group order exceeds size of 200')
+        operations = candidates[np.sort(first)]
+    operations.flags.writeable = False
+    return operations
+
+
 class Group:
     """
     Base immutable class containing information about symmetry groups.
@@ -49,24 +95,36 @@ class Group:
         """
         :param generators: List of operations necessary to construct whole group
         """
-
-        generator_list = []
-        for gen in generators:
-            if gen not in generator_list:
-                generator_list.append(gen)
-
-        def _find_new_product(ops: list[BoundedOperation]) -> list[BoundedOperation]:
-            if len(ops) > 200:
-                raise ValueError('Generated group order exceeds size of 200')
-            new = list({o1 * o2 for o1, o2 in itertools_product(ops, ops)})
-            new = list(set(ops).union(new))
-            return _find_new_product(new) if len(new) > len(ops) else ops
-
-        self.__generators = list(generator_list)
-        self.__operations = list(_find_new_product(generator_list))
-        self.name = self.auto_generated_name
+        matrices = np.zeros((len(generators), 4, 4), dtype=np.int64)
+        for matrix, generator in zip(matrices, generators):
+            matrix[:3, :3] = generator.tf
+            matrix[:3, 3] = generator._tl24 % 24  # noqa - packed on purpose
+            matrix[3, 3] = 1
+        new_group = self._from_matrices(matrices)
+        self.__generators = new_group.generators
+        self.__operations = new_group.operations
+        self._name = None
         self.number = 0
 
+    @classmethod
+    def _from_matrices(cls, generators: np.ndarray) -> 'Group':
+        """
+        Generate group using a (n, 4, 4) int array with augmented matrices
+        of its generators, with translations expressed in 1/24ths.
+        :param generators: Stacked augmented matrices of group generators
+        :return: Symmetry group generated by given generator matrices
+        """
+        keys = list(dict.fromkeys(g.tobytes() for g in
+                                  np.asarray(generators, dtype=np.int64)))
+        operations = _closure(tuple(keys))
+
+        def _to_operation(m: np.ndarray) -> BoundedOperation:
+            return BoundedOperation(m[:3, :3], m[:3, 3] / 24)
+        return cls.from_generators_operations(
+            generators=[_to_operation(np.frombuffer(k, dtype=np.int64)
+                                      .reshape(4, 4)) for k in keys],
+            operations=[_to_operation(o) for o in operations])
+
     @classmethod
     def from_generators_operations(
             cls,
@@ -80,33 +138,49 @@ class Group:
         :param operations: A complete list of group operations
         :return: Symmetry group with given generators and operators.
         """
-        new_group = cls()
+        new_group = cls.__new__(cls)
         new_group.__generators = generators
         new_group.__operations = operations
+        new_group._name = None
+        new_group.number = 0
         return new_group
 
     @classmethod
     def from_hall_symbol(cls, hall_symbol: Union[str, HallSymbol]) -> 'Group':
         if isinstance(hall_symbol, str):
             hall_symbol = HallSymbol(hall_symbol)
-        return cls(*hall_symbol.generators)
+        return cls._from_matrices(hall_symbol.generator_matrices)
+
+    @classmethod
+    def from_hall_symbols(
+            cls,
+            hall_symbols: Iterable[Union[str, HallSymbol]],
+    ) -> list['Group']:
+        """
+        Generate many groups at once. Every unique Hall symbol is parsed once,
+        and closures of generator sets are cached, so groups sharing e.g.
+        lattice, inversion and first generator do not repeat this work.
+        :param hall_symbols: Hall symbols of groups to be generated
+        :return: List of symmetry groups generated from given Hall symbols
+        """
+        return [cls.from_hall_symbol(hs) for hs in hall_symbols]
 
     def __eq__(self, other: 'Group') -> bool:
-        return all([o in self.operations for o in other.operations])\
-               and all([o in other.operations for o in self.operations])
+        if isinstance(other, Group):
+            return self._operation_code_set == other._operation_code_set
+        return NotImplemented
 
     def __lt__(self, other: 'Group') -> bool:
-        return len(self.operations) < len(other.operations) and \
-            all([o in other.operations for o in self.operations])
+        return self._operation_code_set < other._operation_code_set
 
     def __gt__(self, other: 'Group') -> bool:
         return other.__lt__(self)
 
     def __le__(self, other: 'Group') -> bool:
-        return self.__eq__(other) or self.__lt__(other)
+        return self._operation_code_set <= other._operation_code_set
 
     def __ge__(self, other: 'Group') -> bool:
-        return self.__eq__(other) or other.__lt__(self)
+        return other.__le__(self)
 
     def __repr__(self) -> str:
         return 'Group('+',\n      '.join([repr(g) for g in self.generators])+')'
@@ -115,7 +189,23 @@ class Group:
         return f'{self.name} (#{abs(self.number)}{"*" if self.number<0 else""})'
 
     def __hash__(self) -> int:
-        return sum(hash(o) for o in self.operations)
+        return hash(self._operation_code_set)
+
+    def __getstate__(self) -> dict:
+        """Copy and pickle group without values of its cached properties"""
+        return {k: v for k, v in self.__dict__.items()
+                if not isinstance(getattr(type(self), k, None), cached_property)}
+
+    @property
+    def name(self) -> str:
+        """Name of the group; if not set, `auto_generated_name` is used"""
+        if self._name is None:
+            self._name = self.auto_generated_name
+        return self._name
+
+    @name.setter
+    def name(self, value: str) -> None:
+        self._name = value
 
     @property
     def auto_generated_name(self) -> str:
@@ -152,6 +242,190 @@ class Group:
     def order(self) -> int:
         return len(self.__operations)
 
+    @staticmethod
+    def _read_only(array: np.ndarray) -> np.ndarray:
+        array.flags.writeable = False
+        return array
+
+    @cached_property
+    def rotations(self) -> np.ndarray:
+        """Read-only (n, 3, 3) int array with stacked `tf` of all operations"""
+        tfs = [o.tf for o in self.operations]
+        return self._read_only(np.array(tfs, dtype=int).reshape(-1, 3, 3))
+
+    @cached_property
+    def translations24(self) -> np.ndarray:
+        """Read-only (n, 3) int array with stacked `tl` of ops, in 1/24ths"""
+        tls = [o._tl24 for o in self.operations]  # noqa - packed on purpose
+        return self._read_only(np.array(tls, dtype=int).reshape(-1, 3))
+
+    @cached_property
+    def translations(self) -> np.ndarray:
+        """Read-only (n, 3) float array with stacked `tl` of all operations"""
+        return self._read_only(self.translations24 / 24)
+
+    @cached_property
+    def reciprocal_rotations(self) -> np.ndarray:
+        """Read-only (n, 3, 3) int array with stacked reciprocal `tf`s"""
+        inverse = np.linalg.inv(self.rotations).transpose(0, 2, 1)
+        return self._read_only(np.rint(inverse).astype(int).reshape(-1, 3, 3))
+
+    @cached_property
+    def matrices(self) -> np.ndarray:
+        """Read-only (n, 4, 4) float array with stacked augmented matrices"""
+        matrices = np.zeros((self.order, 4, 4), dtype=float)
+        matrices[:, :3, :3] = self.rotations
+        matrices[:, :3, 3] = self.translations
+        matrices[:, 3, 3] = 1.0
+        return self._read_only(matrices)
+
+    @cached_property
+    def glides24(self) -> np.ndarray:
+        """
+        Read-only (n, 3) int array with stacked intrinsic translation (glide)
+        components of all operations, in 1/24ths. Evaluated as in
+        `Operation.glide`: (1 + W + ... + W^23) @ w / 24 for all at once.
+        """
+        power = np.broadcast_to(np.eye(3, dtype=int), self.rotations.shape)
+        power_sum = np.zeros_like(power)
+        for _ in range(24):
+            power_sum = power_sum + power
+            power = power @ self.rotations
+        glides = np.einsum('oij,oj->oi', power_sum, self.translations24)
+        return self._read_only(glides // 24)
+
+    @cached_property
+    def operation_codes(self) -> np.ndarray:
+        """
+        Read-only (n,) int64 array with every operation packed into a single
+        integer. Each of 9 rotation elements, offset by 8, occupies 4 bits,
+        while 3 translation elements use base 24, so that two operations
+        of a group share a code if and only if they are equal.
+        """
+        codes = _pack_operations(self.rotations, self.translations24)
+        return self._read_only(codes)
+
+    @cached_property
+    def _operation_code_set(self) -> frozenset:
+        """Frozenset of `operation_codes` used for fast group comparisons"""
+        return frozenset(self.operation_codes.tolist())
+
+    def transform_points(self, points: np.ndarray) -> np.ndarray:
+        """
+        Transform an (N, 3) array of point coordinates by every operation
+        in the group at once, including their translation part.
+
+        :param points: A vertical array of coordinate triplets kept in rows
+        :return: An (n, N, 3) array with points transformed by n operations
+        """
+        points = np.asarray(points)
+        return np.einsum('oij,nj->oni', self.rotations, points) \
+            + self.translations[:, np.newaxis, :]
+
+    def transform_vectors(self, vectors: np.ndarray) -> np.ndarray:
+        """
+        Transform an (N, 3) array of vectors, e.g. hkl indices of reciprocal
+        space point group, by rotation part of every operation in the group.
+        The dtype of input is preserved, so integer hkls stay integer.
+
+        :param vectors: A vertical array of vector triplets kept in rows
+        :return: An (n, N, 3) array with vectors transformed by n operations
+        """
+        vectors = np.asarray(vectors)
+        rotations = self.rotations.astype(np.result_type(vectors, int))
+        return np.einsum('oij,nj->oni', rotations, vectors)
+
+    @cached_property
+    def _multiplication_table(self) -> np.ndarray:
+        """Int (n, n) array with `[i, j]` the index of operation i * j"""
+        r, t24 = self.rotations, self.translations24
+        rotations = np.einsum('aij,bjk->abik', r, r).reshape(-1, 3, 3)
+        translations24 = (np.einsum('aij,bj->abi', r, t24)
+                          + t24[:, np.newaxis, :]).reshape(-1, 3) % 24
+        codes = _pack_operations(rotations, translations24)
+        order = np.argsort(self.operation_codes)
+        sorter = np.searchsorted(self.operation_codes, codes, sorter=order)
+        return self._read_only(order[sorter].reshape(self.order, self.order))
+
+    def wrap_points(self, points: np.ndarray, tolerance: float = 1e-4) \
+            -> np.ndarray:
+        """
+        Wrap an array of fractional coordinates into the unit cell [0, 1).
+        Values within `tolerance` from 1 are wrapped to 0, so that positions
+        generated by operations with translations on the 24ths grid,
+        such as 1/3 + 2/3, consistently land at the origin.
+
+        :param points: An array of fractional coordinates of any shape
+        :param tolerance: Maximum distance to 1 regarded as equal to 1
+        :return: An array of the same shape with coordinates in [0, 1)
+        """
+        wrapped = np.mod(points, 1.)
+        wrapped[wrapped > 1. - tolerance] = 0.
+        return wrapped
+
+    def stabilizers(self, points: np.ndarray, tolerance: float = 1e-4) \
+            -> np.ndarray:
+        """
+        Determine site-symmetry of an (N, 3) array of fractional coordinates,
+        i.e. which operations of the group map every point onto itself
+        or its lattice translation.
+
+        :param points: A vertical array of coordinate triplets kept in rows
+        :param tolerance: Maximum fractional coordinate difference allowed
+            between point and its image for them to be considered equal
+        :return: An (N, n) bool array, True if point is invariant under op.
+        """
+        points = np.asarray(points, dtype=float).reshape(-1, 3)
+        delta = self.transform_points(points) - points[np.newaxis, :, :]
+        delta -= np.rint(delta)
+        return np.all(np.abs(delta) < tolerance, axis=2).T
+
+    def orbits(self, points: np.ndarray, tolerance: float = 1e-4) \
+            -> tuple[np.ndarray, np.ndarray, list[np.ndarray]]:
+        """
+        Compute symmetry-equivalent positions of an (N, 3) array of fractional
+        coordinates in a single vectorized pass. Unique orbit positions
+        are determined from left cosets of every point's stabilizer,
+        so no pairwise comparison between generated positions is needed.
+        Points sharing the same site-symmetry are processed together.
+
+        :example:
+
+        >>> from hikari.symmetry import SG
+        >>> positions, multiplicities, stabilizers = SG['P21/c'].orbits(
+        ...     [[0.1, 0.2, 0.3], [0., 0., 0.]])
+        >>> multiplicities
+        array([4, 2])
+        >>> [SG['P21/c'].operations[i].code for i in stabilizers[1]]
+        ['x,y,z', '-x,-y,-z']
+
+        :param points: A vertical array of coordinate triplets kept in rows
+        :param tolerance: Maximum fractional coordinate difference allowed
+            between point and its image for them to be considered equal
+        :return: A tuple with: an (M, 3) array of all unique orbit positions
+            wrapped into the unit cell, where the orbit of i-th point spans
+            rows `sum(multiplicities[:i])` to `sum(multiplicities[:i+1])`;
+            an (N,) array of multiplicities; and a list of N arrays
+            with indices of operations constituting each point's stabilizer.
+        """
+        points = np.asarray(points, dtype=float).reshape(-1, 3)
+        stabilizers = self.stabilizers(points, tolerance=tolerance)
+        patterns, pattern_index = np.unique(
+            stabilizers, axis=0, return_inverse=True)
+        pattern_index = pattern_index.reshape(-1)
+        table = self._multiplication_table
+        # coset label of op g under stabilizer S is min(g * s for s in S)
+        labels = np.where(patterns[:, np.newaxis, :], table[np.newaxis],
+                          self.order).min(axis=2)
+        representatives = labels == np.arange(self.order)[np.newaxis, :]
+        representatives = representatives[pattern_index]
+        images = self.transform_points(points).transpose(1, 0, 2)
+        positions = self.wrap_points(images[representatives], tolerance)
+        multiplicities = representatives.sum(axis=1)
+        stabilizer_indices = [np.flatnonzero(patterns[p])
+                              for p in pattern_index]
+        return positions, multiplicities, stabilizer_indices
+
     @property
     def is_centrosymmetric(self) -> bool:
         """True if group has centre of symmetry; False otherwise."""
@@ -194,9 +468,9 @@ class Group:
                 return False
         return True
 
-    @property
+    @cached_property
     def system(self) -> System:
-        """Predicted crystal system associated with this group"""
+        """Predicted crystal system associated with this group (cached)"""
         folds = [op.fold for op in self.operations]
         orients = [op.orientation for op in self.operations]
 
@@ -220,21 +494,41 @@ class Group:
 
     def lauefy(self) -> 'Group':
         """
+        The result is evaluated once and cached by the instance,
+        so it must not be modified in-place.
+
         :return: New PointGroup with centre of symmetry added to generators.
         :rtype: Group
         """
+        return self._laue_group
+
+    @cached_property
+    def _laue_group(self) -> 'Group':
         inv = BoundedOperation.from_code('-x, -y, -z')
         return Group(*self.operations, inv)
 
     def reciprocate(self) -> 'Group':
+        """
+        The result is evaluated once and cached by the instance,
+        so it must not be modified in-place.
+
+        :return: New PointGroup acting on the reciprocal space.
+        :rtype: Group
+        """
+        return self._reciprocal_group
+
+    @cached_property
+    def _reciprocal_group(self) -> 'Group':
         new_generators = [op.reciprocal for op in self.generators]
         return Group(*new_generators)
 
-    def transform(self, m) -> 'Group':
+    def transform(self, m: np.ndarray) -> Union['Group', list['Group']]:
         r"""
         Transform the group using 4x4 matrix. For reference, see `bilbao
         resources <https://www.cryst.ehu.es/cryst/trmatrix.html>`_ or `IUCr
         pamphlet no. 22 <https://www.iucr.org/education/pamphlets/22>`_.
+        If a (k, 4, 4) stack of matrices is given, return a list of k groups,
+        all obtained using a single inversion and tensor contraction.
 
         :example:
 
@@ -244,16 +538,72 @@ class Group:
         >>> SG['P21/c'].transform(matrix).auto_generated_name
         P 21/n
 
-        :param m: A 4x4 array containing information about new base and origin.
+        :param m: A 4x4 array containing information about new base and origin
+            or a (k, 4, 4) array with k such matrices.
         :type m: np.ndarray
-        :return: Group with new, transformed basis and origin.
-        :rtype: Group
+        :return: Group with new, transformed basis and origin or their list.
+        :rtype: Union[Group, list[Group]]
+        """
+        transformed = self.transform_groups([self], m)
+        return transformed[0][0] if np.ndim(m) == 2 else [t[0] for t in transformed]
+
+    @classmethod
+    def transform_groups(
+            cls,
+            groups: list['Group'],
+            m: np.ndarray,
+    ) -> list[list['Group']]:
+        """
+        Transform many `groups` using one or many 4x4 matrices `m` at once.
+        Operations of all groups are stacked and transformed together
+        using a single matrix inversion and tensor contraction.
+
+        :param groups: List of groups to be transformed.
+        :type groups: list[Group]
+        :param m: A 4x4 array containing information about new base and origin
+            or a (k, 4, 4) array with k such matrices.
+        :type m: np.ndarray
+        :raises ValueError: if transformed rotations are not integer or
+            translations can not be expressed in 1/24ths.
+        :return: List with list of transformed groups for every matrix.
+        :rtype: list[list[Group]]
         """
-        transformed_group = Group.from_generators_operations(
-            generators=[BoundedOperation.from_matrix(np.linalg.inv(m) @ g.matrix @ m)
-                        for g in self.generators],
-            operations=[BoundedOperation.from_matrix(np.linalg.inv(m) @ o.matrix @ m)
-                        for o in self.operations])
-        transformed_group.name = self.name+' @ '+repr(m)[6:-1].replace(' ', '')
-        transformed_group.number = -abs(self.number)
-        return transformed_group
+        ms = np.asarray(m).reshape(-1, 4, 4)
+        ms_inv = np.linalg.inv(ms)
+        gen_counts = [len(g.generators) for g in groups]
+        op_counts = [g.order for g in groups]
+        matrices = np.concatenate(
+            [np.array([o.matrix for o in g.generators]) for g in groups]
+            + [g.matrices for g in groups])
+        transformed = np.einsum('kij,njl,klm->knim', ms_inv, matrices, ms)
+        transformed[..., :3, 3] *= 24
+        rounded = np.rint(transformed)
+        if not np.allclose(transformed, rounded, atol=1e-6):
+            raise ValueError('Transformation yields non-integer rotations or '
+                             'translations not expressible in 1/24ths')
+        rounded = rounded.astype(np.int64)
+        rounded[..., :3, 3] %= 24
+        splits = np.cumsum(gen_counts + op_counts)[:-1]
+
+        def _to_operation(m_: np.ndarray) -> BoundedOperation:
+            return BoundedOperation(m_[:3, :3], m_[:3, 3] / 24)
+
+        transformed_groups = []
+        for matrix, stack in zip(ms, rounded):
+            parts = np.split(stack, splits)
+            suffix = ' @ ' + repr(matrix)[6:-1].replace(' ', '')
+            groups_k = []
+            for g, gens, ops in zip(groups, parts[:len(groups)],
+                                    parts[len(groups):]):
+                new_group = cls.from_generators_operations(
+                    generators=[_to_operation(o) for o in gens],
+                    operations=[_to_operation(o) for o in ops])
+                new_group.__dict__['rotations'] = \
+                    cls._read_only(np.ascontiguousarray(ops[:, :3, :3]))
+                new_group.__dict__['translations24'] = \
+                    cls._read_only(np.ascontiguousarray(ops[:, :3, 3]))
+                new_group.name = g.name + suffix
+                new_group.number = -abs(g.number)
+                groups_k.append(new_group)
+            transformed_groups.append(groups_k)
+        return transformed_groups
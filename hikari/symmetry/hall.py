@@ -1,4 +1,5 @@
 import re
+from functools import lru_cache
 from typing import List, Match, Union
 
 import numpy as np
@@ -151,6 +152,31 @@ class HallSymbol:
 
     @property
     def generators(self) -> List[BoundedOperation]:
+        return [BoundedOperation(m[:3, :3], m[:3, 3] / 24)
+                for m in self.generator_matrices]
+
+    @property
+    def generator_matrices(self) -> np.ndarray:
+        """
+        Read-only (n, 4, 4) int array with augmented matrices of generators,
+        with translations expressed in 1/24ths. Every normalized symbol
+        is parsed only once, and the result is shared by all its instances.
+        """
+        return self._parse(self.symbol)
+
+    @classmethod
+    @lru_cache(maxsize=None)
+    def _parse(cls, symbol: str) -> np.ndarray:
+        generators = cls(symbol)._build_generators()
+        matrices = np.zeros((len(generators), 4, 4), dtype=np.int64)
+        for matrix, generator in zip(matrices, generators):
+            matrix[:3, :3] = generator.tf
+            matrix[:3, 3] = generator._tl24  # noqa - packed on purpose
+            matrix[3, 3] = 1
+        matrices.flags.writeable = False
+        return matrices
+
+    def _build_generators(self) -> List[BoundedOperation]:
         elements: re.Match = self.elements
 
         # lattice / centering generators
@@ -5,7 +5,7 @@ to the actual contents of the whole library,
 but do significantly improve clarity of the code present in other modules.
 """
 
-from .certain_float import cfloat
+from .certain_float import cfloat, cfloats_with_su
 from .chem_tools import chemical_elements, split_atom_label
 from .dict_tools import dict_union
 from .interval import Interval
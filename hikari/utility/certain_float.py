@@ -1,3 +1,6 @@
+from typing import Iterable
+
+import numpy as np
 import uncertainties
 
 
@@ -12,3 +15,42 @@ def cfloat(string):
     :rtype: float
     """
     return uncertainties.ufloat_fromstr(representation=string).n
+
+
+def cfloats_with_su(strings: Iterable[str]) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Convert many strings with numbers in shorthand cif notation, such as
+    "12.34(5)" or "1.234(5)e1", into arrays of nominal values and standard
+    uncertainties at once. Uncertainties are scaled according to the number
+    of decimal places and exponent of each number. Numbers given without
+    uncertainty get 0, while cif unknown "?" and inapplicable "." get nan.
+
+    :param strings: strings to be converted
+    :type strings: Iterable[str]
+    :return: two float arrays with nominal values and standard uncertainties
+    :rtype: tuple[np.ndarray, np.ndarray]
+    """
+    strings = np.char.strip(np.asarray(strings, dtype=str).reshape(-1))
+    if not strings.size:
+        return np.empty(0, dtype=float), np.empty(0, dtype=float)
+    upper = np.char.find(strings, 'E') >= 0
+    if upper.any():
+        strings[upper] = np.char.lower(strings[upper])
+    head, _, rest = np.char.partition(strings, '(').T
+    su, _, tail = np.char.partition(rest, ')').T
+    number = np.char.add(head, tail)
+    missing = (number == '?') | (number == '.')
+    number[missing] = 'nan'
+    mantissa, _, exponent = np.char.partition(number, 'e').T
+    point = np.char.find(mantissa, '.')
+    scale = -np.where(point >= 0, np.char.str_len(mantissa) - point - 1, 0)
+    if (exponent != '').any():
+        scale = scale + _to_float(np.where(exponent == '', '0', exponent))
+    su = _to_float(np.where(su == '', '0', su)) * 10. ** scale
+    su[missing] = np.nan
+    return _to_float(number), su
+
+
+def _to_float(strings: np.ndarray) -> np.ndarray:
+    """Convert array of str to float; faster than `np.ndarray.astype`"""
+    return np.array(strings.tolist(), dtype=float)
@@ -1,15 +1,20 @@
 import copy
 import pathlib
+import shutil
 import tempfile
 import unittest
+from unittest import mock
 
 import numpy as np
 import uncertainties
 
 from hikari.dataframes import BaseFrame, CifBlock, CifFrame, HklFrame, \
-    UBaseFrame
-from hikari.dataframes.cif import CifValidator
-from hikari.symmetry import PG
+    ResFrame, UBaseFrame
+from hikari.dataframes.cif import CifReader, CifValidator
+from hikari.dataframes.res import f0, form_factor_species
+from hikari import resources
+from hikari.resources import Xray_atomic_form_factors
+from hikari.symmetry import PG, SG
 
 RAD60 = 1.0471975511965976
 RAD70 = 1.2217304763960306
@@ -29,6 +34,7 @@ U90 = uncertainties.ufloat(90.0, 1.0)
 nacl_cif_path = str(pathlib.Path(__file__).parent.joinpath('NaCl.cif'))
 nacl_fcf_path = str(pathlib.Path(__file__).parent.joinpath('NaCl.fcf'))
 nacl_hkl_path = str(pathlib.Path(__file__).parent.joinpath('NaCl.hkl'))
+nacl_res_path = str(pathlib.Path(__file__).parent.joinpath('NaCl.res'))
 
 
 class TestBaseFrame(unittest.TestCase):
@@ -115,6 +121,45 @@ class TestCifFrameReader(unittest.TestCase):
         self.assertIn('NaCl', self.c)
         self.assertIsInstance(self.c['NaCl'], CifBlock)
 
+    def test_parse_lines_of_document(self):
+        self.c.read(nacl_cif_path)
+        with open(nacl_cif_path, 'r') as cif_file:
+            lines = cif_file.read().splitlines()
+        parsed = CifReader(nacl_cif_path).parse(lines)
+        self.assertEqual(list(parsed), list(self.c.keys()))
+        self.assertEqual(parsed['NaCl'], self.c['NaCl'])
+
+    def test_read_selected_blocks(self):
+        self.c.read(nacl_cif_path, blocks=['NaCl_negative_ADPs'])
+        self.assertEqual(list(self.c.keys()), ['NaCl_negative_ADPs'])
+        self.assertIsInstance(self.c['NaCl_negative_ADPs'], CifBlock)
+
+    def test_read_lazy(self):
+        self.c.read(nacl_cif_path, lazy=True)
+        self.assertEqual(len(self.c), 3)
+        self.assertNotIsInstance(self.c.data['NaCl'], CifBlock)
+        self.assertEqual(self.c['NaCl']['_cell_length_a'], '5.64109(5)')
+        self.assertIsInstance(self.c.data['NaCl'], CifBlock)
+        c = CifFrame()
+        c.read(nacl_cif_path)
+        self.assertEqual(dict(c.items()), dict(self.c.items()))
+
+    def test_read_many(self):
+        missing_path = str(pathlib.Path(nacl_cif_path).with_name('missing.cif'))
+        paths = [nacl_cif_path, nacl_fcf_path, missing_path]
+        read, failed = CifFrame.read_many(paths, workers=2)
+        self.assertEqual(list(read), paths[:2])
+        self.assertIsInstance(failed[missing_path], FileNotFoundError)
+        self.c.read(nacl_fcf_path)
+        self.assertEqual(dict(read[nacl_fcf_path].items()), dict(self.c.items()))
+        read, failed = CifFrame.read_many(
+            paths, workers=1, blocks=['NaCl'],
+            columns={'_cell_length_a': float, '_refln_index_h': np.int8})
+        self.assertEqual(len(failed), 1)
+        self.assertAlmostEqual(read[nacl_cif_path]['NaCl']['_cell_length_a'],
+                               5.64109)
+        self.assertEqual(len(read[nacl_fcf_path]['NaCl']['_refln_index_h']), 111)
+
 
 class TestCifBlockReader(unittest.TestCase):
     def setUp(self) -> None:
@@ -130,6 +175,32 @@ class TestCifBlockReader(unittest.TestCase):
         self.assertEqual(self.b['_atom_type_symbol'], ['Cl', 'Na'])
         self.assertEqual(len(self.b['_space_group_symop_operation_xyz']), 192)
 
+    def test_block_index(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = str(pathlib.Path(temp_dir) / 'NaCl.cif')
+            shutil.copy(nacl_cif_path, path)
+            reader = CifReader(path)
+            self.assertEqual(reader.blocks, {'NaCl': 0, 'NaCl_olex2_C2/m': 9308,
+                                             'NaCl_negative_ADPs': 9915})
+            index = reader.block_index(persist=True)
+            self.assertTrue(reader.index_path.exists())
+            self.assertEqual(CifReader(path).block_index(), index)
+            with open(path, 'a') as cif_file:
+                cif_file.write('\ndata_appended\n_cell_length_a 1\n')
+            self.assertIn('appended', CifReader(path).block_index())
+        self.b.read(nacl_cif_path, block='NaCl_olex2_C2/m')
+        self.assertEqual(self.b['_space_group_name_H-M_alt'], 'C 1 2/m 1')
+
+    def test_tokenize(self):
+        lines = ["_a 'quoted # text'  # comment\n", "_b\n", ";\n",
+                 " text  field\n", ";\n", "_c '_value'' \"it's\" C1' ''\n"]
+        words, delimited = zip(*CifReader.tokenize(lines))
+        self.assertEqual(words[0], ['_a', 'quoted # text'])
+        self.assertEqual(words[2], ['\n text  field'])
+        self.assertEqual(words[3], ['_c', "_value'", "it's", "C1'", ''])
+        self.assertEqual(delimited[1], None)
+        self.assertEqual(delimited[3], [False, True, True, False, True])
+
 
 class TestCifBlockGeneral(unittest.TestCase):
     b = CifBlock()
@@ -179,6 +250,25 @@ class TestCifBlockGeneral(unittest.TestCase):
         u_typ = uncertainties.ufloat_fromstr
         self.assertEqual(repr(self.b.get_as_type(k, typ=u_typ)), repr([U1, U1]))
 
+    def test_get_as_array(self):
+        a, a_su = self.b.get_as_array('_cell_length_a', su=True)
+        self.assertAlmostEqual(float(a), 5.64109)
+        self.assertAlmostEqual(float(a_su), 0.00005)
+        h = self.b.get_as_array('_diffrn_refln_index_h', dtype=int)
+        self.assertEqual(h.shape, (8578, ))
+        self.assertTrue(np.issubdtype(h.dtype, np.integer))
+        self.assertIs(self.b.get_as_array('_nonexistent_key'), None)
+
+    def test_get_as_structured_array(self):
+        keys = ['_atom_site_label', '_atom_site_U_iso_or_equiv']
+        atoms = self.b.get_as_structured_array(
+            keys, dtypes={'_atom_site_label': str}, su=True)
+        self.assertEqual(list(atoms['_atom_site_label']), ['Cl1', 'Na1'])
+        self.assertTrue(np.allclose(atoms['_atom_site_U_iso_or_equiv_su'],
+                                    [0.00004, 0.00006]))
+        with self.assertRaises(ValueError):
+            self.b.get_as_structured_array(keys + ['_diffrn_refln_index_h'])
+
     def test_get_as_type_nonexistent(self):
         self.assertIs(self.b.get_as_type('_nonexistent_key', str), None)
 
@@ -228,6 +318,15 @@ class TestCifValidator(unittest.TestCase):
         self.assertEqual(self.v.get('_atom_site_fract_x')['_type'], 'numb')
         self.assertIs(self.v.get('nonexistent_key'), None)
 
+    def test_get_after_assignment(self):
+        v = CifValidator()
+        v['hikari_test_'] = CifBlock({'_name': ['_hikari_test_a'], '_list': 'yes'})
+        self.assertIs(v.get('_hikari_test_a'), v['hikari_test_'])
+        self.assertIs(v.get__list('hikari_test_a'), True)
+        del v['hikari_test_']
+        self.assertIs(v.get('_hikari_test_a'), None)
+        self.assertEqual(v.get__category('_atom_site_fract_x'), 'atom_site')
+
     def test_get__category(self):
         cat = 'atom_site'
         self.assertEqual(self.v.get__category('atom_site_fract_'), cat)
@@ -235,6 +334,22 @@ class TestCifValidator(unittest.TestCase):
         self.assertEqual(self.v.get__category('_atom_site_fract_x'), cat)
         self.assertEqual(self.v.get__category('nonexistent_key', 'def'), 'def')
 
+    def test_index_consistency(self):
+        index = CifValidator.compile_index(CifValidator.read_dictionary())
+        self.assertEqual(index, {k: dict(v) for k, v in self.v.items()})
+
+    def test_missing_index_falls_back_to_dictionary(self):
+        loaded = vars(resources).pop('cif_core_index_json', None)
+        missing = {'cif_core_index_json': 'missing.json'}
+        try:
+            with mock.patch.dict(resources._lazy_text_resources, missing):
+                v = CifValidator()
+        finally:
+            vars(resources).pop('cif_core_index_json', None)
+            if loaded is not None:
+                resources.cif_core_index_json = loaded
+        self.assertEqual(dict(v.items()), dict(self.v.items()))
+
     def test_get__list(self):
         self.assertIs(self.v.get__list('atom_site_fract_'), True)
         self.assertIs(self.v.get__list('refine_ls_number_reflns'), None)
@@ -267,6 +382,57 @@ class TestCifWriter(unittest.TestCase):
             with open(self.temp_path2, 'r') as cif2_contents:
                 self.assertEqual(cif1_contents.read(), cif2_contents.read())
 
+    def test_write_cif_file_append(self):
+        self.c_cif1.write(self.temp_path1)
+        reader = CifReader(self.temp_path1)
+        reader.block_index(persist=True)
+        self.c_cif2.read(nacl_fcf_path)
+        self.c_cif2.data['NaCl_fcf'] = self.c_cif2.data.pop('NaCl')
+        self.c_cif2.write(self.temp_path1, append=True)
+        b = CifBlock({'_refine_ls_R_factor_all': '0.0123'})
+        b.write(self.temp_path1, append=True)
+        persisted_index = reader._load_block_index()  # noqa
+        self.assertIsNotNone(persisted_index)
+        reader.index_path.unlink()
+        self.assertEqual(persisted_index, reader.block_index())
+        self.assertEqual(list(persisted_index)[-1], 'NaCl_fcf')
+        c = CifFrame()
+        c.read(self.temp_path1, blocks=['NaCl', 'NaCl_fcf'])
+        self.assertEqual(c['NaCl'], self.c_cif1['NaCl'])
+        self.assertEqual(c['NaCl_fcf']['_refine_ls_R_factor_all'], '0.0123')
+        self.c_cif1.write(self.temp_path2)
+        CifFrame().write(self.temp_path1)
+        for name in self.c_cif1.keys():
+            CifFrame({name: self.c_cif1[name]}).write(self.temp_path1, True)
+        with open(self.temp_path1, 'r') as cif1_contents:
+            with open(self.temp_path2, 'r') as cif2_contents:
+                self.assertEqual(cif1_contents.read(), cif2_contents.read())
+
+    def test_write_cif_loops(self):
+        b = CifBlock()
+        b['_refln_index_h'] = np.tile(np.arange(-100, 100, dtype=np.int8), 200)
+        b['_refln_F_squared_meas'] = np.linspace(0, 1, 40_000)
+        b['_refln_F_squared_meas'][0] = np.nan
+        b['_atom_site_label'] = ['C1', 'C 2', '', 'C\n4']
+        b['_atom_site_type_symbol'] = ['C'] * 4
+        b['_atom_site_fract_x'] = ['0.1234567890(12)'] * 4
+        b['_atom_site_fract_y'] = ['0.2345678901(23)'] * 4
+        b['_atom_site_fract_z'] = ['0.3456789012(34)'] * 4
+        b['_atom_site_U_iso_or_equiv'] = ['0.0123456789(12)'] * 4
+        b.write(self.temp_path1)
+        with open(self.temp_path1, 'r') as cif_file:
+            lines = cif_file.read().splitlines()
+        self.assertLessEqual(max(map(len, lines)), 80)
+        c = CifFrame()
+        c.read(self.temp_path1)
+        h = c['hikari'].get_as_array('_refln_index_h', dtype=np.int8)
+        f = c['hikari'].get_as_array('_refln_F_squared_meas')
+        self.assertTrue(np.array_equal(h, b['_refln_index_h']))
+        self.assertTrue(np.allclose(f, b['_refln_F_squared_meas'],
+                                    equal_nan=True))
+        for k in ['_atom_site_label', '_atom_site_fract_z']:
+            self.assertEqual(c['hikari'][k], b[k])
+
 
 class TestHklFrame(unittest.TestCase):
     h1 = HklFrame()
@@ -298,6 +464,52 @@ class TestHklFrame(unittest.TestCase):
         self.h2.read(nacl_hkl_path, hkl_format='free_4')
         self.assertEqual(self.h2.table.__len__(), 8578)
 
+    def test_read_fcf(self):
+        self.h2.read(nacl_fcf_path, hkl_format='shelx_fcf14')
+        self.assertEqual(len(self.h2), 111)
+        self.assertAlmostEqual(self.h2.table['Ic'].iloc[0], 327.34)
+
+    def test_read_corrupted(self):
+        with open(nacl_hkl_path, 'r') as hkl_file:
+            hkl_lines = hkl_file.read().splitlines()
+        hkl_lines[10] = hkl_lines[10][:14] + 'x' + hkl_lines[10][15:]
+        temp_dir = tempfile.TemporaryDirectory()
+        temp_path = str(pathlib.Path(temp_dir.name) / 'corrupted.hkl')
+        with open(temp_path, 'w') as hkl_file:
+            hkl_file.write('\n'.join(hkl_lines))
+        for hkl_format in ('shelx_4', 'free_4'):
+            with self.assertRaises(ValueError):
+                self.h2.read(temp_path, hkl_format=hkl_format)
+        with self.assertRaises(ValueError):
+            self.h2.read(nacl_fcf_path, hkl_format='shelx_fcf')
+        temp_dir.cleanup()
+
+    def test_read_cif(self):
+        self.h2.read_cif(nacl_fcf_path, block='NaCl')
+        self.assertEqual(len(self.h2), 111)
+        self.assertEqual(self.h2.table['h'].dtype, np.int8)
+        self.assertAlmostEqual(self.h2.table['I'].iloc[0], 374.53)
+        self.assertAlmostEqual(self.h2.a_d, 5.6411)
+
+    def test_read_cif_embedded(self):
+        with open(nacl_hkl_path, 'r') as hkl_file:
+            hkl_text = hkl_file.read()
+        with open(nacl_fcf_path, 'r') as fcf_file:
+            fcf_text = fcf_file.read()
+        temp_dir = tempfile.TemporaryDirectory()
+        temp_path = str(pathlib.Path(temp_dir.name) / 'embedded.cif')
+        with open(temp_path, 'w') as cif_file:
+            cif_file.write(f'data_hkl\n_shelx_hkl_file\n;\n{hkl_text};\n'
+                           f'data_fcf\n_shelx_fcf_file\n;\n{fcf_text};\n')
+        self.h2.read_cif(temp_path)
+        self.assertEqual(len(self.h2), 8578)
+        self.assertTrue(np.array_equal(self.h2.table['I'], self.h1.table['I']))
+        self.h2.read_cif(temp_path, block='fcf')
+        self.assertEqual(len(self.h2), 111)
+        with self.assertRaises(KeyError):
+            self.h2.read_cif(nacl_cif_path, block='NaCl')
+        temp_dir.cleanup()
+
     def test_write(self):
         temp_dir = tempfile.TemporaryDirectory()
         temp_path = str(pathlib.Path(temp_dir.name) / 'temp.hkl')
@@ -324,6 +536,34 @@ class TestHklFrame(unittest.TestCase):
         self.h2.find_equivalents(point_group=PG['m-3m'])
         self.assertEqual(self.h2.table['equiv'].nunique(), 111)
 
+    def test_extinct(self):
+        self.h2.extinct(space_group=SG['Fm-3m'])
+        self.assertEqual(len(self.h2), 8578)
+        self.h2.extinct(space_group=SG['Fd-3m'])
+        self.assertEqual(len(self.h2), 7860)
+
+    def test_screen_space_groups(self):
+        screen = self.h1.screen_space_groups(laue_class=32)
+        self.assertEqual(len(screen), 28)
+        self.assertEqual(screen.loc['225', 'Absent'], 0)
+        self.assertEqual(screen.loc['227:1', 'Absent'], 718)
+        self.assertAlmostEqual(screen.loc['227:1', 'I/si(I)'], 35.110564, 5)
+        self.assertTrue((self.h1.screen_space_groups()['Absent'] >= 0).all())
+        for not_laue_class in (3, 999):
+            with self.assertRaises(ValueError):
+                self.h1.screen_space_groups(laue_class=not_laue_class)
+        pattern_index, absent = self.h1._absence_patterns([])  # noqa
+        self.assertEqual(len(pattern_index), len(self.h1))
+        self.assertEqual(absent.shape[1], 0)
+
+    def test_screen_laue_classes(self):
+        screen = self.h1.screen_laue_classes()
+        self.assertEqual(len(screen), 14)
+        self.assertAlmostEqual(screen.loc['32', 'R_int'], 0.024264, 5)
+        self.assertAlmostEqual(screen.loc['32', 'CC'], 0.999538, 5)
+        self.assertAlmostEqual(screen.loc['32', 'Cplt'], 0.299191, 5)
+        self.assertGreater(screen.loc['27', 'R_int'], 0.2)
+
     def test_place(self):
         self.h2.place()
         xyz = self.h2.table.loc[:, ['x', 'y', 'z']].to_numpy()
@@ -402,6 +642,100 @@ class TestHklFrame(unittest.TestCase):
         temp_dir.cleanup()
 
 
+class TestResFrame(unittest.TestCase):
+    atom_lines = ['SFAC Cl Na O H', 'FVAR 1.0 0.6',
+                  'CL1 1 0.0 0.0 0.0 10.02083 0.01793 0.01793 =',
+                  '    0.01793 0.0 0.0 0.0',
+                  'NA1 2 0.5 0.0 0.0 10.02083 0.02129']
+    extra_atom_lines = ['O1 3 0.1 0.2 0.3 21.0 0.02 0.03 0.04 0.005 -0.003 0.001',
+                        'H1 4 0.2 0.3 0.4 -21.0 -1.5']
+
+    def setUp(self) -> None:
+        self.r = ResFrame()
+        self.r.parse('\n'.join(self.atom_lines))
+        self.r.edit_cell(a=5.641087, b=5.641087, c=5.641087)
+
+    def test_read(self):
+        self.r.read(nacl_res_path)
+        self.assertAlmostEqual(self.r.a_d, 5.641087)
+        self.assertEqual(list(self.r.atoms['label']), ['CL1', 'NA1'])
+        self.assertEqual(list(self.r.atoms['sfac']), [1, 2])
+        self.assertTrue(np.allclose(self.r.atoms['x'], [0.0, 0.5]))
+        self.assertTrue(np.allclose(self.r.atoms['occupancy'], 0.02083))
+        self.assertTrue(np.allclose(self.r.atoms['u33'], [0.01793, 0.02129]))
+        self.assertTrue(np.all(np.isnan(self.r.atoms['u_iso'])))
+        self.assertEqual(self.r.data['SFAC'], ['Cl', 'Na'])
+        self.assertEqual(len(self.r.data['SYMM']), 23)
+        self.assertEqual(len(self.r.data['PEAK']), 5)
+
+    def test_parse_atoms(self):
+        self.r.parse('\n'.join(self.atom_lines + self.extra_atom_lines +
+                                ['AFIX 0', 'DFIX 1.5 O1 H1 C1 C2']))
+        atoms = self.r._atom_arrays()  # noqa
+        self.assertEqual(list(atoms['element']), ['Cl', 'Na', 'O', 'H'])
+        self.assertTrue(np.allclose(atoms['occupancy'],
+                                    [0.02083, 0.02083, 0.6, 0.4]))
+        self.assertTrue(np.isnan(self.r.atoms['u11'][1]))
+        self.assertAlmostEqual(self.r.atoms['u_iso'][1], 0.02129)
+        self.assertAlmostEqual(atoms['u_iso'][3], 1.5 * 0.03)
+        self.assertIn('Line not interpreted: AFIX 0', self.r.data['REM'])
+        self.assertIn('Line not interpreted: DFIX 1.5 O1 H1 C1 C2',
+                      self.r.data['REM'])
+
+    def test_parse_instructions_after_fvar(self):
+        self.r.parse('\n'.join(self.atom_lines + [
+            'SUMP 1.0 0.001 1.0 2 1.0 3',
+            'TWIN -1 0 0 0 -1 0 0 0 -1 2',
+            'FRAG 17 10 11 12 90 90 90',
+            'BASF 0.1 0.2 0.3 0.4 0.5',
+            'C1 4 0.1 0.2 0.3']))
+        self.assertEqual(list(self.r.atoms['label']), ['CL1', 'NA1', 'C1'])
+        self.assertAlmostEqual(self.r.atoms['occupancy'][2], 1.0)
+        self.assertAlmostEqual(self.r.atoms['u_iso'][2], 0.05)
+        for instruction in ('SUMP', 'TWIN', 'FRAG', 'BASF'):
+            self.assertTrue(any(instruction in line
+                                for line in self.r.data['REM']))
+
+    def test_form_factor(self):
+        hkl = np.array([[1, 1, 1], [0, 0, 2], [0, 2, 2], [1, 0, 0]])
+        f = self.r.form_factor(hkl, SG['Fm-3m'])
+        self.assertTrue(np.allclose(f, [17.650131, 81.389048, 66.248269, 0.]))
+
+    def test_form_factor_symmetry(self):
+        self.r.parse('\n'.join(self.atom_lines + self.extra_atom_lines))
+        self.r.edit_cell(a=7.2, b=16.5, c=11.3)
+        hkl = np.array([[1, 2, 3], [-1, 2, 3], [1, -2, 3], [-1, -2, -3]])
+        f = self.r.form_factor(hkl, SG['Pnma'])
+        self.assertTrue(np.allclose(np.abs(f), np.abs(f[0])))
+
+    def test_f0(self):
+        sintl = np.array([0.0, 0.3, 0.7, 1.2])
+        species_ids = [form_factor_species[e] for e in ('Na', 'Cl', 'O1-')]
+        f = f0(species_ids, sintl)
+        self.assertEqual(f.shape, (3, 4))
+        for f_species, e in zip(f, ('Na', 'Cl', 'O1-')):
+            s = Xray_atomic_form_factors.loc[e]
+            expected = sum(s[f'a{i}'] * np.exp(-s[f'b{i}'] * sintl ** 2)
+                           for i in range(1, 5)) + s['c']
+            self.assertTrue(np.allclose(f_species, expected))
+        self.assertTrue(np.array_equal(f0(species_ids, sintl[[2, 1, 2]]),
+                                       f[:, [2, 1, 2]]))
+        with mock.patch('hikari.dataframes.res._f0_evaluate') as evaluate:
+            self.assertTrue(np.array_equal(f0(species_ids, sintl), f))
+            evaluate.assert_not_called()
+
+    def test_form_factor_fft(self):
+        self.r.parse('\n'.join(self.atom_lines + self.extra_atom_lines))
+        self.r.edit_cell(a=7.2, b=16.5, c=11.3, be=105)
+        hkl = np.array([[1, 2, 3], [-1, 2, 3], [0, 0, 4], [5, -7, 2]])
+        f_direct = self.r.form_factor(hkl, SG['P21/c'])
+        f_fft = self.r.form_factor_fft(hkl, SG['P21/c'])
+        self.assertTrue(np.allclose(f_fft, f_direct,
+                                    atol=1e-4 * np.abs(f_direct).max()))
+        with self.assertRaises(ValueError):
+            self.r.form_factor_fft(hkl, SG['P21/c'], oversampling=1.0)
+
+
 class TestUBaseFrame(unittest.TestCase):
 
     def setUp(self) -> None:
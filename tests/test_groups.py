@@ -5,9 +5,10 @@ import warnings
 
 from hikari.resources import (point_groups_dataframe, space_groups_dataframe,
                               point_groups_json, space_groups_json)
-from hikari.symmetry import BoundedOperation, Group, PG, SG
+from hikari.symmetry import BoundedOperation, Group, HallSymbol, PG, SG
 from hikari.symmetry.catalog import GroupCatalog, AmbiguousGroupAccessorWarning
 
+import numpy as np
 import pandas as pd
 
 
@@ -20,6 +21,128 @@ class TestGroup(unittest.TestCase):
         sg230_generators = [BoundedOperation.from_code(c) for c in sg230_generator_codes]
         _ = Group(*sg230_generators)
 
+    def test_group_from_hall_symbols(self):
+        p21c, pmm2, p21c_again = Group.from_hall_symbols(
+            ['-P 2ybc', 'p_2_-2', HallSymbol('-p_2ybc')])
+        self.assertEqual(p21c, SG['P21/c'])
+        self.assertEqual(p21c, p21c_again)
+        self.assertEqual(pmm2.order, 4)
+        self.assertEqual(pmm2.name, pmm2.auto_generated_name)
+        self.assertIs(HallSymbol('-P 2ybc').generator_matrices,
+                      HallSymbol('-p_2ybc').generator_matrices)
+        self.assertEqual(len(HallSymbol('F 4d 2 3 -1d').generators), 8)
+
+    def test_group_stacked_arrays(self):
+        g = SG['P21/c']
+        self.assertEqual(g.rotations.shape, (4, 3, 3))
+        self.assertEqual(g.translations24.shape, (4, 3))
+        self.assertEqual(g.matrices.shape, (4, 4, 4))
+        for o, tf, tl24, m in zip(g.operations, g.rotations,
+                                  g.translations24, g.matrices):
+            self.assertTrue(np.array_equal(o.tf, tf))
+            self.assertTrue(np.array_equal(o._tl24, tl24))  # noqa
+            self.assertTrue(np.allclose(o.matrix, m))
+        for o, r in zip(g.operations, g.reciprocal_rotations):
+            self.assertTrue(np.array_equal(o.reciprocal.tf, r))
+        with self.assertRaises(ValueError):
+            g.rotations[0, 0, 0] = 2
+        for o, glide24 in zip(g.operations, g.glides24):
+            self.assertTrue(np.allclose(o.glide, glide24 / 24))
+
+    def test_group_transform_points_and_vectors(self):
+        g = SG['Pnma']
+        xyz = np.array([[0.1, 0.2, 0.3], [0.5, 0.25, 0.0]])
+        hkl = np.array([[1, 2, 3], [-1, 0, 4]], dtype=np.int8)
+        xyz_t = g.transform_points(xyz)
+        hkl_t = g.transform_vectors(hkl)
+        self.assertEqual(xyz_t.shape, (8, 2, 3))
+        self.assertTrue(np.issubdtype(hkl_t.dtype, np.integer))
+        for o, xyz_o, hkl_o in zip(g.operations, xyz_t, hkl_t):
+            self.assertTrue(np.allclose(o.transform(xyz), xyz_o))
+            self.assertTrue(np.array_equal(o.tf @ hkl.T, hkl_o.T))
+
+    def test_group_orbits(self):
+        g = SG['Fd-3m']
+        points = np.array([[0., 0., 0.], [.125, .125, .125], [.5, .5, .5],
+                           [.11, .23, .37], [1., 1., 1.]])
+        positions, multiplicities, stabilizers = g.orbits(points)
+        self.assertEqual(list(multiplicities), [8, 16, 8, 192, 8])
+        self.assertEqual(len(positions), sum(multiplicities))
+        self.assertTrue(np.all((positions >= 0) & (positions < 1)))
+        self.assertEqual([len(s) for s in stabilizers], [24, 12, 24, 1, 24])
+        for point, stabilizer in zip(points, stabilizers):
+            for i in stabilizer:
+                image = g.operations[i].transform(point[np.newaxis])[0]
+                self.assertTrue(np.allclose(image - np.rint(image - point), point))
+        first_orbit = positions[:multiplicities[0]]
+        self.assertEqual(len(np.unique(np.round(first_orbit, 6), axis=0)), 8)
+
+    def test_group_transform(self):
+        p21c_to_p21n = np.array([(1, 0, 1, 0), (0, 1, 0, 0),
+                                 (-1, 0, 0, 0), (0, 0, 0, 1)])
+        p21n = SG['P21/c'].transform(p21c_to_p21n)
+        self.assertEqual(p21n.auto_generated_name, 'P_21/n')
+        self.assertEqual(p21n.number, -14)
+        p21n_again, p21c = SG['P21/c'].transform(
+            np.stack([p21c_to_p21n, np.eye(4)]))
+        self.assertEqual(p21n, p21n_again)
+        self.assertEqual(p21c, SG['P21/c'])
+        with self.assertRaises(ValueError):
+            SG['P21/c'].transform(np.array([(1, 0, 0, .01), (0, 1, 0, 0),
+                                             (0, 0, 1, 0), (0, 0, 0, 1)]))
+
+    def test_group_catalog_transform(self):
+        origin_shift = np.eye(4)
+        origin_shift[:3, 3] = [0.25, 0.25, 0.25]
+        shifted = PG.transform(origin_shift)
+        self.assertEqual(len(shifted), len(PG))
+        for g_old, g_new in zip(PG.values(), shifted.values()):
+            self.assertEqual(g_old.transform(origin_shift), g_new)
+
+    def test_group_catalog_subsets_share_groups(self):
+        standard = SG.standard
+        self.assertIs(standard.values()[0], SG.values()[0])
+        self.assertEqual(list(standard.table.columns), list(SG.table.columns))
+        self.assertTrue(standard.table['standard'].all())
+        self.assertEqual(list(standard.table.index), list(range(len(standard))))
+
+    def test_group_comparison(self):
+        p1, p_1, p21c = SG['P1'], SG['P-1'], SG['P21/c']
+        self.assertEqual(p21c, SG['P21/c'])
+        self.assertEqual(hash(p21c), hash(SG['P21/c']))
+        self.assertNotEqual(p21c, p_1)
+        self.assertTrue(p1 < p_1 < p21c)
+        self.assertTrue(p21c > p_1 >= p_1)
+        self.assertFalse(p21c <= p_1)
+        self.assertEqual(len(set(p21c.operation_codes)), p21c.order)
+
+    def test_group_maximal_subgroups(self):
+        mmm_maximal = PG.maximal_subgroups(PG['mmm'])
+        self.assertEqual(set(mmm_maximal.table['HM_simple']),
+                         {'2/m', '222', 'mm2'})
+        for g in mmm_maximal.values():
+            self.assertLess(g, PG['mmm'])
+        self.assertEqual(len(PG.subgroups(PG['1'])), 0)
+        self.assertIn('m-3m', set(PG.supergroups(PG['m-3']).table['HM_simple']))
+        self.assertEqual(set(PG.minimal_supergroups(PG['m-3']).table['HM']),
+                         {'m_-3_m'})
+
+    def test_group_derived_groups_are_cached(self):
+        g = SG['P21/c']
+        self.assertIs(g.reciprocate(), g.reciprocate())
+        self.assertIs(g.reciprocate().lauefy(), g.reciprocate().lauefy())
+        self.assertEqual(g.reciprocate(), PG['2/m'])
+        self.assertIs(g.system, Group.System.monoclinic)
+
+    def test_group_catalog_class_numbers(self):
+        table = SG.table.set_index('n_c')
+        self.assertEqual(table.loc['14:b1', 'point_group'], 5)
+        self.assertEqual(table.loc['112', 'point_group'], 14)
+        self.assertEqual(table.loc['112', 'laue_class'], 15)
+        self.assertEqual(table.loc['173', 'laue_class'], 23)
+        self.assertEqual(set(SG.table['laue_class']),
+                         {2, 5, 8, 11, 15, 17, 20, 23, 27, 29, 32})
+
 
 class TestPointGroupCatalog(unittest.TestCase):
     catalogue_object: GroupCatalog = PG
@@ -6,13 +6,19 @@ import unittest
 from unittest import mock
 
 import numpy as np
+from uncertainties import ufloat, unumpy
 
 from hikari.scripts import calculate_similarity_indices, potency_map, \
-    completeness_statistics, dac_statistics, reformat_hkl, simulate_dac
+    completeness_statistics, dac_statistics, reformat_hkl, simulate_dac, \
+    simulate_dataset
+from hikari.dataframes import BaseFrame, UBaseFrame
+from hikari.scripts.compare_adps import CELL_PARAMETERS, similarity_indices
+from hikari.utility import det3x3
 
 
 nacl_cif_path = str(pathlib.Path(__file__).parent.joinpath('NaCl.cif'))
 nacl_hkl_path = str(pathlib.Path(__file__).parent.joinpath('NaCl.hkl'))
+nacl_res_path = str(pathlib.Path(__file__).parent.joinpath('NaCl.res'))
 nacl_commons = {'a': 5.64109, 'b': 5.64109, 'c': 5.64109,
                 'al': 90, 'be': 90, 'ga': 90, 'input_path': nacl_hkl_path,
                 'input_format': 'shelx_4', 'input_wavelength': 'MoKa'}
@@ -74,6 +80,95 @@ class TestCompareADPsScripts(unittest.TestCase):
             last_line_contents = out.readlines()[-1].strip().split()
             self.assertAlmostEqual(float(last_line_contents[-3]), 50.0)
 
+    def test_similarity_indices_batched(self):
+        bf = BaseFrame()
+        adps1 = np.stack([np.eye(3), np.eye(3), np.diag([1, 2, 3]), np.eye(3)])
+        adps2 = np.stack([np.eye(3), 2 * np.eye(3), np.diag([2, 1, 3]),
+                          np.diag([-1, 1, 1])])
+        r12 = 2 ** 1.5 * 8 ** 0.25 / 27 ** 0.5
+        expected = [0.0, 100 * (1 - r12), 100 * (1 - 2 * 2 ** 0.5 / 3), 100.0]
+        sis = similarity_indices(adps1, adps2, bf, bf)
+        self.assertTrue(np.allclose(sis, expected))
+        sis = similarity_indices(adps1, adps2, bf, bf, normalize=True)
+        self.assertTrue(np.allclose(sis[[0, 1, 3]], [0.0, 0.0, 100.0]))
+
+    def test_similarity_indices_jacobians(self):
+        def sis(adps_, cells_, normalize_, jacobians=False):
+            frames = [BaseFrame(), BaseFrame()]
+            for frame, cell in zip(frames, cells_):
+                frame.edit_cell(**dict(zip(CELL_PARAMETERS, cell)))
+            return similarity_indices(*adps_, *frames, normalize=normalize_,
+                                      jacobians=jacobians)
+
+        rng = np.random.default_rng(1)
+        a = rng.normal(size=(2, 5, 3, 3)) * 0.1
+        adps = np.einsum('knij,knlj->knil', a, a) + 0.01 * np.eye(3)
+        cells = np.array([[5, 6, 7, 80, 95, 105], [5.1, 5.9, 7.2, 82, 94, 103]])
+        adp_indices = [(0, 0), (1, 1), (2, 2), (0, 1), (0, 2), (1, 2)]
+        for normalize in (False, True):
+            _, jacobians = sis(adps, cells, normalize, jacobians=True)
+            for k in (0, 1):
+                for p, (i, j) in enumerate(adp_indices):
+                    step = np.zeros_like(adps)
+                    step[k, :, i, j] = step[k, :, j, i] = 1e-6
+                    d = (sis(adps + step, cells, normalize)
+                         - sis(adps - step, cells, normalize)) / 2e-6
+                    self.assertTrue(np.allclose(d, jacobians[f'adps_{k+1}'][:, p],
+                                                rtol=1e-4, atol=1e-6))
+                for p in range(6):
+                    step = np.zeros_like(cells)
+                    step[k, p] = 1e-5
+                    d = (sis(adps, cells + step, normalize)
+                         - sis(adps, cells - step, normalize)) / 2e-5
+                    self.assertTrue(np.allclose(d, jacobians[f'cell_{k+1}'][:, p],
+                                                rtol=1e-4, atol=1e-6))
+
+
+    def test_similarity_indices_uncertainties(self):
+        def u_cart(adp, frame):
+            m = np.diag([frame.a_r, frame.b_r, frame.c_r]) @ frame.A_d
+            return m.T @ adp @ m
+
+        def u_adp(u, su):
+            u11, u22, u33, u12, u13, u23 = \
+                [ufloat(v, s) for v, s in zip(u, su)]
+            return np.array([[u11, u12, u13], [u12, u22, u23],
+                             [u13, u23, u33]])
+
+        cells = [[5, 6, 7, 80, 95, 105], [5.1, 5.9, 7.2, 82, 94, 103]]
+        cell_sus = [[1e-3, 2e-3, 1e-3, 0.05, 0.02, 0.03],
+                    [2e-3, 1e-3, 3e-3, 0.02, 0.04, 0.01]]
+        adps = [[0.02, 0.03, 0.025, 0.004, -0.002, 0.001],
+                [0.025, 0.028, 0.03, 0.002, 0.001, -0.003]]
+        adp_sus = [[1e-3, 2e-3, 1e-3, 5e-4, 4e-4, 3e-4],
+                   [2e-3, 1e-3, 2e-3, 3e-4, 5e-4, 4e-4]]
+        frames, u_frames = [BaseFrame(), BaseFrame()], []
+        for frame, cell, cell_su in zip(frames, cells, cell_sus):
+            frame.edit_cell(**dict(zip(CELL_PARAMETERS, cell)))
+            u_frames.append(UBaseFrame())
+            u_frames[-1].edit_cell(**{k: ufloat(v, s) for k, v, s
+                                      in zip(CELL_PARAMETERS, cell, cell_su)})
+        adps_frac = [unumpy.nominal_values(u_adp(u, su))[np.newaxis]
+                     for u, su in zip(adps, adp_sus)]
+        for normalize in (False, True):
+            sis, jacobians = similarity_indices(*adps_frac, *frames,
+                                                normalize=normalize,
+                                                jacobians=True)
+            sis_su = np.sqrt(sum(np.sum((jacobians[k][0] * np.array(su)) ** 2)
+                                 for k, su in zip(('adps_1', 'adps_2',
+                                                   'cell_1', 'cell_2'),
+                                                  adp_sus + cell_sus)))
+            c1, c2 = [u_cart(u_adp(u, su), frame) for u, su, frame
+                      in zip(adps, adp_sus, u_frames)]
+            d1, d2 = det3x3(c1), det3x3(c2)
+            if normalize:
+                c1, c2 = c1 / d1 ** (1 / 3), c2 / d2 ** (1 / 3)
+                d1, d2 = det3x3(c1), det3x3(c2)
+            expected = 100 * (1 - 2 ** 1.5 * (d1 * d2) ** 0.25
+                              / det3x3(c1 + c2) ** 0.5)
+            self.assertAlmostEqual(sis[0], expected.n, places=10)
+            self.assertAlmostEqual(sis_su, expected.s, places=8)
+
 
 class TestHklScripts(unittest.TestCase):
     temp_dir = tempfile.TemporaryDirectory()
@@ -128,6 +223,23 @@ class TestHklScripts(unittest.TestCase):
         with open(self.hkl_path, 'r') as f:
             self.assertEqual(len(f.readlines()), 553)
 
+    def test_simulate_dataset(self):
+        kwargs = dict(a=5.64109, b=5.64109, c=5.64109, al=90, be=90, ga=90,
+                      space_group='Fm-3m', res_path=nacl_res_path,
+                      resolution=0.7, opening_angle=35, batches=3, seed=42,
+                      chunk_size=200)
+        p1 = simulate_dataset(**kwargs)
+        p2 = simulate_dataset(method='direct', workers=2, **kwargs)
+        self.assertTrue(np.allclose(p1.table['I'], p2.table['I']))
+        self.assertTrue(np.array_equal(p1.table['b'], p2.table['b']))
+        self.assertEqual(set(p1.table['b']), {1, 2, 3})
+        self.assertLess(p1.table['r'].max(), 1 / 0.7)
+        p3 = simulate_dataset(**dict(kwargs, noise='none'))
+        hkl = p3.table.loc[:, ['h', 'k', 'l']].to_numpy()
+        absent = (hkl % 2).sum(axis=1) % 3 != 0
+        self.assertTrue(np.allclose(p3.table['I'][absent], 0))
+        self.assertGreater(p3.table['I'][~absent].min(), 0)
+
 
 if __name__ == '__main__':
     unittest.main()
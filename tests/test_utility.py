@@ -35,6 +35,13 @@ class TestCertainFloat(unittest.TestCase):
     def test_on_pretty_print_ufloat(self):
         self.assertEqual(cfloat(u'12.34±5.67'), 12.34)
 
+    def test_cfloats_with_su(self):
+        values, sus = cfloats_with_su(['12.34(567)', '1.234(5)e1', '1.234E1(5)',
+                                       '5', '12(3)', '?', '.'])
+        self.assertTrue(np.allclose(values[:5], [12.34, 12.34, 12.34, 5, 12]))
+        self.assertTrue(np.allclose(sus[:5], [5.67, 0.05, 0.05, 0, 3]))
+        self.assertTrue(np.all(np.isnan(values[5:])) and np.all(np.isnan(sus[5:])))
+
 
 class TestInterval(unittest.TestCase):
     def test_creation(self):